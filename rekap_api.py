@@ -0,0 +1,329 @@
+# rekap_api.py
+# ==========================================
+# 🔌 API JSON Read-only (ASGI, tanpa framework)
+# Menyajikan rekap per unit, demografi, dan jumlah vacant dari dataset yang di-cache,
+# supaya tools internal tidak perlu scrape halaman Streamlit.
+#
+# Setiap respons membawa ETag = versi dataset (hash isi workbook). Klien cukup
+# mengirim If-None-Match untuk revalidasi murah (304 tanpa menghitung ulang).
+#
+# Endpoint (GET/HEAD):
+#   /api/version                 → versi dataset
+#   /api/units                   → daftar unit (database utama & Struktur Organisasi)
+#   /api/rekap?unit=<unit>       → rekap kategori + demografi (default: Semua Unit)
+#   /api/demografi?unit=<unit>   → gender, disabilitas, kelompok usia
+#   /api/vacant[?unit=<unit>]    → total posisi / terisi / vacant per Unit Kerja
+#
+# Jalankan:
+#   $ uvicorn rekap_api:app --port 8502
+# Konfigurasi via env: REKAP_DATABASE, REKAP_ORG, REKAP_TTL (detik, default 3600).
+# File lokal yang diganti langsung terpakai; REKAP_TTL berlaku untuk sumber remote.
+# ==========================================
+
+import asyncio
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qs
+
+import rekap_engine as engine
+import rekap_loader
+
+LOCAL_FILE = "Cek Test Profile.xlsx"
+ORG_STRUCTURE_FILE = "Struktur Organisasi.xlsx"
+
+
+class DatasetUnavailable(Exception):
+    """Dataset belum bisa dimuat (file/URL tidak tersedia atau gagal parse)."""
+
+
+class DatasetProvider:
+    """Cache dataset in-process dengan TTL + memo report per (versi, unit).
+
+    Sumber lokal dicek tiap request lewat file_identity (cukup os.stat), jadi file
+    yang diganti langsung terpakai; TTL hanya berlaku untuk sumber remote. Reload
+    tidak parse ulang workbook yang isinya sama, dan request lain tetap dilayani
+    dataset lama selama reload berjalan.
+
+    `loader(previous)` bisa diganti (mis. dataset sintetis) agar API bisa diuji in-process.
+    """
+
+    def __init__(self, employee_source, org_source=None, ttl=3600, loader=None, clock=time.monotonic):
+        self.employee_source = employee_source
+        self.org_source = org_source
+        self.ttl = ttl
+        self._loader = loader or (
+            lambda previous: rekap_loader.load_dataset(self.employee_source, self.org_source, previous=previous)
+        )
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._dataset = None
+        self._loaded_at = None
+        self._identities = None
+        self._memo = {}
+
+    def _source_identities(self):
+        """Hash isi sumber lokal (None untuk remote / file tidak ada)."""
+        identities = []
+        for source in (self.employee_source, self.org_source):
+            identity = rekap_loader.file_identity(source)
+            identities.append(identity.sha256 if identity else None)
+        return tuple(identities)
+
+    def _needs_reload(self, identities) -> bool:
+        if self._loaded_at is None:
+            return True
+        return identities != self._identities or (self._clock() - self._loaded_at) >= self.ttl
+
+    def get(self):
+        """Dataset terkini. Reload bila TTL habis / file lokal berubah; versi lama dipakai bila reload gagal."""
+        identities = self._source_identities()
+        with self._lock:
+            current = self._dataset
+            if current is not None and not self._needs_reload(identities):
+                return current
+
+        # Single-flight: satu reload dalam satu waktu. Selama reload, request lain
+        # langsung dapat dataset lama; hanya load pertama yang harus ditunggu.
+        if not self._reload_lock.acquire(blocking=current is None):
+            return current
+        try:
+            with self._lock:
+                if self._dataset is not None and not self._needs_reload(identities):
+                    return self._dataset
+                previous = self._dataset
+            dataset, error = self._loader(previous)
+            with self._lock:
+                # Gagal pun dicatat: coba lagi setelah TTL atau saat file berubah lagi
+                self._loaded_at = self._clock()
+                self._identities = identities
+                if dataset is not None:
+                    if previous is None or dataset.version != previous.version:
+                        self._memo = {}
+                    self._dataset = dataset
+                elif self._dataset is None:
+                    self._loaded_at = None
+                    raise DatasetUnavailable(error)
+                return self._dataset
+        finally:
+            self._reload_lock.release()
+
+    def memo(self, dataset, key, compute):
+        """Hitung sekali per (versi dataset, key)."""
+        memo_key = (dataset.version, key)
+        with self._lock:
+            if memo_key in self._memo:
+                return self._memo[memo_key]
+        value = compute()
+        with self._lock:
+            if dataset is self._dataset:
+                self._memo[memo_key] = value
+        return value
+
+
+# -----------------------------
+# 📋 Handler per endpoint
+# -----------------------------
+class NotFound(Exception):
+    pass
+
+
+def _unit_report(provider, dataset, unit):
+    unit_col, eg_col = engine.detect_core_columns(dataset.employees)
+    if not unit_col or not eg_col:
+        raise DatasetUnavailable("Kolom wajib tidak ditemukan: Unit / Employee Group.")
+    _check_unit(provider, dataset, {"unit": unit})
+    return provider.memo(
+        dataset, ("rekap", unit),
+        lambda: engine.report_to_dict(engine.build_unit_report(dataset.employees, unit, unit_col, eg_col)),
+    )
+
+
+def _units(provider, dataset):
+    def compute():
+        unit_col, _ = engine.detect_core_columns(dataset.employees)
+        return engine.list_units(dataset.employees, unit_col) if unit_col else []
+    return provider.memo(dataset, ("units",), compute)
+
+
+def _org_reports(provider, dataset):
+    return provider.memo(dataset, ("vacant",), lambda: engine.build_org_reports(dataset.org_sheets or {}))
+
+
+def _check_unit(provider, dataset, params):
+    unit = params.get("unit", engine.ALL_UNITS)
+    if unit != engine.ALL_UNITS and unit not in _units(provider, dataset):
+        raise NotFound(f"Unit tidak ditemukan: {unit}")
+
+
+def _check_org_unit(provider, dataset, params):
+    unit = params.get("unit")
+    if unit is not None and unit not in _org_reports(provider, dataset):
+        raise NotFound(f"Unit Kerja tidak ditemukan di Struktur Organisasi: {unit}")
+
+
+def handle_version(provider, dataset, params):
+    return {"version": dataset.version}
+
+
+def handle_units(provider, dataset, params):
+    return {
+        "units": _units(provider, dataset),
+        "org_units": list(_org_reports(provider, dataset).keys()),
+    }
+
+
+def handle_rekap(provider, dataset, params):
+    return _unit_report(provider, dataset, params.get("unit", engine.ALL_UNITS))
+
+
+def handle_demografi(provider, dataset, params):
+    report = _unit_report(provider, dataset, params.get("unit", engine.ALL_UNITS))
+    return {
+        "unit": report["unit"],
+        "total_karyawan": report["total_karyawan"],
+        "gender": report["gender"],
+        "disability": report["disability"],
+        "age_counts": report["age_counts"],
+    }
+
+
+def handle_vacant(provider, dataset, params):
+    org_reports = _org_reports(provider, dataset)
+    unit = params.get("unit")
+    if unit is None:
+        return {"units": org_reports, "org_error": dataset.org_error}
+    _check_org_unit(provider, dataset, params)
+    return {"unit": unit, **org_reports[unit]}
+
+
+# Validasi parameter per route: dijalankan SEBELUM cek If-None-Match, supaya
+# parameter tidak valid tetap 404 walau ETag cocok.
+VALIDATORS = {
+    "/api/rekap": _check_unit,
+    "/api/demografi": _check_unit,
+    "/api/vacant": _check_org_unit,
+}
+
+ROUTES = {
+    "/api/version": handle_version,
+    "/api/units": handle_units,
+    "/api/rekap": handle_rekap,
+    "/api/demografi": handle_demografi,
+    "/api/vacant": handle_vacant,
+}
+
+
+# -----------------------------
+# 🌐 ASGI app
+# -----------------------------
+def _etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [t.strip() for t in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+async def _send(send, status, body=b"", headers=None, head_only=False):
+    raw_headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in (headers or {}).items()]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": b"" if head_only else body})
+
+
+async def _send_json(send, status, payload, headers=None, head_only=False):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    all_headers = {
+        "content-type": "application/json; charset=utf-8",
+        "content-length": str(len(body)),
+        **(headers or {}),
+    }
+    await _send(send, status, body, all_headers, head_only)
+
+
+def create_app(provider: DatasetProvider):
+    """Buat ASGI app untuk provider tertentu (dipakai juga untuk uji in-process)."""
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        method = scope.get("method", "GET")
+        head_only = method == "HEAD"
+        if method not in ("GET", "HEAD"):
+            await _send_json(send, 405, {"error": "Method not allowed"}, {"allow": "GET, HEAD"})
+            return
+
+        path = scope.get("path", "").rstrip("/") or "/"
+        handler = ROUTES.get(path)
+        if handler is None:
+            await _send_json(send, 404, {"error": "Endpoint tidak ditemukan", "endpoints": sorted(ROUTES)}, head_only=head_only)
+            return
+
+        try:
+            # Load/refresh dataset bersifat blocking (I/O + parse) → jalankan di thread
+            dataset = await asyncio.to_thread(provider.get)
+        except DatasetUnavailable as e:
+            await _send_json(send, 503, {"error": f"Gagal memuat data utama: {e}"}, head_only=head_only)
+            return
+
+        query = parse_qs(scope.get("query_string", b"").decode("utf-8"))
+        params = {k: v[-1] for k, v in query.items()}
+        validator = VALIDATORS.get(path)
+        try:
+            if validator is not None:
+                await asyncio.to_thread(validator, provider, dataset, params)
+        except NotFound as e:
+            await _send_json(send, 404, {"error": str(e)}, head_only=head_only)
+            return
+        except DatasetUnavailable as e:
+            await _send_json(send, 503, {"error": str(e)}, head_only=head_only)
+            return
+
+        etag = _etag(dataset.version)
+        cache_headers = {"etag": etag, "cache-control": "no-cache"}
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        if _etag_matches(headers.get("if-none-match", ""), etag):
+            await _send(send, 304, headers=cache_headers)
+            return
+
+        try:
+            payload = await asyncio.to_thread(handler, provider, dataset, params)
+        except NotFound as e:
+            await _send_json(send, 404, {"error": str(e)}, head_only=head_only)
+            return
+        except DatasetUnavailable as e:
+            await _send_json(send, 503, {"error": str(e)}, head_only=head_only)
+            return
+        await _send_json(send, 200, {"version": dataset.version, **payload}, cache_headers, head_only)
+
+    return app
+
+
+def _default_provider() -> DatasetProvider:
+    employee_source = os.environ.get("REKAP_DATABASE", LOCAL_FILE)
+    org_source = os.environ.get("REKAP_ORG", ORG_STRUCTURE_FILE) or None
+    ttl = float(os.environ.get("REKAP_TTL", "3600"))
+    return DatasetProvider(employee_source, org_source, ttl=ttl)
+
+
+app = create_app(_default_provider())
+
+
+if __name__ == "__main__":
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn belum terpasang. Jalankan: pip install uvicorn")
+    uvicorn.run(app, host=os.environ.get("REKAP_API_HOST", "127.0.0.1"), port=int(os.environ.get("REKAP_API_PORT", "8502")))
@@ -0,0 +1,149 @@
+# rekap_charts.py
+# ==========================================
+# 📈 Payload Chart Ringkas (tanpa Streamlit)
+# Figure Plotly dashboard (usia & kategori) dibangun lalu diserialisasi SEKALI
+# menjadi spec JSON minimal: layout.template dikosongkan (tema diterapkan Streamlit
+# di frontend) dan nilai numpy sebagai list biasa. Spec ini yang di-cache oleh
+# dashboard per (versi dataset, unit, urutan kustom).
+#
+# Setiap build mencatat waktu build figure, waktu serialisasi (terpisah) & ukuran
+# payload per chart ke CHART_STATS (dibaca oleh rekap_loadtest.py).
+# ==========================================
+
+import json
+import threading
+import time
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# nama chart → {"renders", "builds", "build_ms", "serialize_ms", "max_serialize_ms", "payload_bytes"}
+CHART_STATS = {}
+_STATS_LOCK = threading.Lock()
+
+
+# -----------------------------
+# 🏗️ Figure
+# -----------------------------
+def age_figure(labels, age_counts) -> go.Figure:
+    """Line + Bar chart distribusi kelompok usia."""
+    values = [int(v) for v in age_counts.values]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=list(labels),
+        y=values,
+        name='Jumlah Karyawan',
+        marker_color='#3366CC',
+        text=values,
+        textposition='auto',
+    ))
+    fig.add_trace(go.Scatter(
+        x=list(labels),
+        y=values,
+        name='Tren',
+        mode='lines+markers',
+        line=dict(color='#FF4B4B', width=3),
+        marker=dict(size=10)
+    ))
+    fig.update_layout(
+        title="Tren Distribusi Usia Karyawan",
+        xaxis_title="Kelompok Usia",
+        yaxis_title="Jumlah",
+        height=450,
+        font=dict(size=12),
+        margin=dict(l=20, r=20, t=80, b=20),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+    return fig
+
+
+def category_figure(ordered_summary_df) -> go.Figure:
+    """Bar chart (Viridis) jumlah karyawan per kategori, urutan mengikuti tabel."""
+    categories = ordered_summary_df["Kategori"].tolist()
+    values = [int(v) for v in ordered_summary_df["Jumlah"]]
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=categories,
+                y=values,
+                marker=dict(color=values, colorscale="Viridis", showscale=True),
+                text=values,
+                textposition="auto",
+            )
+        ]
+    )
+    fig.update_layout(
+        title="Distribusi Karyawan Berdasarkan Kategori & Jenis Kontrak (Tetap & Tidak Tetap)",
+        xaxis_title="Kategori Karyawan",
+        yaxis_title="Jumlah Karyawan",
+        height=400,
+        showlegend=False,
+        margin=dict(l=10, r=10, t=60, b=10),
+    )
+    return fig
+
+
+# -----------------------------
+# 📦 Payload + instrumentasi
+# -----------------------------
+def compact_spec(fig: go.Figure) -> dict:
+    """Spec figure minimal (dict JSON biasa) tanpa template bawaan Plotly."""
+    spec = json.loads(pio.to_json(fig, validate=False, remove_uids=True))
+    # Template kosong eksplisit: tanpa ini Plotly mengisi ulang template default (~3 KB)
+    spec.setdefault("layout", {})["template"] = {}
+    return spec
+
+
+def figure_payload(name: str, build) -> dict:
+    """Bangun figure via `build()`, ringkas jadi spec, dan catat waktu & ukurannya.
+
+    Waktu build figure dan waktu serialisasi (compact_spec + ukur payload) dicatat terpisah.
+    """
+    started = time.perf_counter()
+    fig = build()
+    built = time.perf_counter()
+    spec = compact_spec(fig)
+    payload_bytes = len(json.dumps(spec, separators=(",", ":")).encode("utf-8"))
+    build_ms = (built - started) * 1000
+    serialize_ms = (time.perf_counter() - built) * 1000
+    with _STATS_LOCK:
+        stats = CHART_STATS.setdefault(name, _empty_stats())
+        stats["builds"] += 1
+        stats["build_ms"] += build_ms
+        stats["serialize_ms"] += serialize_ms
+        stats["max_serialize_ms"] = max(stats["max_serialize_ms"], serialize_ms)
+        stats["payload_bytes"] = payload_bytes
+    return spec
+
+
+def record_render(name: str):
+    """Catat satu render chart (dari cache maupun build baru)."""
+    with _STATS_LOCK:
+        CHART_STATS.setdefault(name, _empty_stats())["renders"] += 1
+
+
+def chart_stats() -> dict:
+    """Ringkasan per chart: render, build, cache hit rate, rata-rata build & serialisasi, ukuran payload."""
+    with _STATS_LOCK:
+        snapshot = {name: dict(stats) for name, stats in CHART_STATS.items()}
+    return {
+        name: {
+            "renders": s["renders"],
+            "builds": s["builds"],
+            "hit_rate": round(1 - s["builds"] / s["renders"], 3) if s["renders"] else 0.0,
+            "avg_build_ms": round(s["build_ms"] / s["builds"], 2) if s["builds"] else 0.0,
+            "avg_serialize_ms": round(s["serialize_ms"] / s["builds"], 2) if s["builds"] else 0.0,
+            "max_serialize_ms": round(s["max_serialize_ms"], 2),
+            "payload_bytes": s["payload_bytes"],
+        }
+        for name, s in sorted(snapshot.items())
+    }
+
+
+def reset_stats():
+    with _STATS_LOCK:
+        CHART_STATS.clear()
+
+
+def _empty_stats() -> dict:
+    return {"renders": 0, "builds": 0, "build_ms": 0.0, "serialize_ms": 0.0, "max_serialize_ms": 0.0, "payload_bytes": 0}
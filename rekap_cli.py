@@ -0,0 +1,151 @@
+# rekap_cli.py
+# ==========================================
+# 🖥️ CLI Rekapitulasi Karyawan (batch, tanpa browser)
+# Generate report lengkap untuk SEMUA unit secara paralel (multi-proses)
+# lalu tulis ke JSON, CSV, atau XLSX. Cocok untuk job malam (nightly).
+#
+# Contoh:
+#   python rekap_cli.py --format json --output reports/
+#   python rekap_cli.py --source "Cek Test Profile.xlsx" --org "Struktur Organisasi.xlsx" --format xlsx
+#   python rekap_cli.py --format partitions --output partitions/   (dataset terpartisi per unit)
+# ==========================================
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import rekap_engine as engine
+import rekap_loader as loader
+import rekap_partition
+
+LOCAL_FILE = "Cek Test Profile.xlsx"
+ORG_STRUCTURE_FILE = "Struktur Organisasi.xlsx"
+
+# State per worker process (diisi sekali oleh initializer, bukan per unit)
+_WORKER_DF = None
+_WORKER_COLS = (None, None)
+
+
+def _init_worker(df: pd.DataFrame):
+    global _WORKER_DF, _WORKER_COLS
+    _WORKER_DF = df
+    _WORKER_COLS = engine.detect_core_columns(df)
+
+
+def _unit_report(unit: str) -> dict:
+    unit_col, eg_col = _WORKER_COLS
+    return engine.report_to_dict(engine.build_unit_report(_WORKER_DF, unit, unit_col, eg_col))
+
+
+def generate_reports(df: pd.DataFrame, workers=None) -> dict:
+    """Report (dict JSON-serializable) untuk Semua Unit + setiap unit, paralel per proses."""
+    unit_col, eg_col = engine.detect_core_columns(df)
+    if not unit_col or not eg_col:
+        raise ValueError("Kolom wajib tidak ditemukan: Unit / Employee Group.")
+    units = [engine.ALL_UNITS] + engine.list_units(df, unit_col)
+
+    if workers == 1:
+        _init_worker(df)
+        return {u: _unit_report(u) for u in units}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df,)) as pool:
+        results = pool.map(_unit_report, units, chunksize=max(1, len(units) // (4 * (workers or os.cpu_count() or 1))))
+        return dict(zip(units, results))
+
+
+def write_outputs(reports: dict, org_reports: dict, fmt: str, output_dir: Path, meta: dict) -> list:
+    """Tulis report ke output_dir. Mengembalikan daftar file yang ditulis."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    if fmt == "json":
+        path = output_dir / "rekap.json"
+        payload = {**meta, "units": reports, "struktur_organisasi": org_reports}
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        written.append(path)
+        return written
+
+    tables = engine.reports_to_tables(reports, org_reports)
+    if fmt == "csv":
+        for name, table in tables.items():
+            path = output_dir / f"{name}.csv"
+            table.to_csv(path, index=False)
+            written.append(path)
+    elif fmt == "xlsx":
+        path = output_dir / "rekap.xlsx"
+        with pd.ExcelWriter(path) as writer:
+            for name, table in tables.items():
+                table.to_excel(writer, sheet_name=name[:31], index=False)
+        written.append(path)
+    else:
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+    return written
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Generate rekap karyawan untuk semua unit (tanpa Streamlit).")
+    parser.add_argument("--source", default=LOCAL_FILE, help="Path/URL database utama (default: %(default)s)")
+    parser.add_argument("--sheet", default=0, help="Nama/index sheet database utama (default: sheet pertama)")
+    parser.add_argument("--org", default=ORG_STRUCTURE_FILE, help="Path/URL Struktur Organisasi; kosongkan untuk skip")
+    parser.add_argument("--format", choices=["json", "csv", "xlsx", "partitions"], default="json",
+                        help="'partitions' menulis dataset terpartisi per unit + manifest untuk dashboard")
+    parser.add_argument("--output", default="reports", help="Folder output (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah worker process (default: jumlah CPU)")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    sheet = int(args.sheet) if str(args.sheet).isdigit() else args.sheet
+    started = time.perf_counter()
+
+    df, error = loader.load_excel_data(args.source, sheet_name=sheet)
+    if error:
+        print(f"❌ Gagal memuat data utama: {error}", file=sys.stderr)
+        return 1
+
+    org_sheets, org_reports = None, {}
+    if args.org:
+        org_sheets, org_error = loader.load_org_sheets(args.org)
+        if org_error:
+            print(f"ℹ️ Struktur Organisasi dilewati: {org_error}", file=sys.stderr)
+        elif args.format != "partitions":
+            org_reports = engine.build_org_reports(org_sheets)
+
+    if args.format == "partitions":
+        try:
+            manifest = rekap_partition.build_partitions(df, org_sheets, args.output)
+        except ValueError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        print(f"✅ {Path(args.output) / rekap_partition.MANIFEST_FILE} (versi {manifest['version']})")
+        print(f"⏱️ {len(manifest['units'])} unit dipartisi dalam {time.perf_counter() - started:.2f} detik")
+        return 0
+
+    try:
+        reports = generate_reports(df, workers=args.workers)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    meta = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "source": str(args.source),
+        "org_source": str(args.org) if args.org else None,
+    }
+    written = write_outputs(reports, org_reports, args.format, Path(args.output), meta)
+    elapsed = time.perf_counter() - started
+    for path in written:
+        print(f"✅ {path}")
+    print(f"⏱️ {len(reports)} unit selesai dalam {elapsed:.2f} detik")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
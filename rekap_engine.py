@@ -0,0 +1,508 @@
+# rekap_engine.py
+# ==========================================
+# 🧮 Engine Rekapitulasi Karyawan (tanpa Streamlit)
+# Dipakai oleh streamlit_app.py, CLI batch (rekap_cli.py), pengujian & benchmark.
+# Fitur:
+# - Rekap Employee Group + breakdown Karyawan Tidak Tetap
+# - Demografi (Gender, Disabilitas, Kelompok Usia)
+# - Daftar Karyawan (kolom terpilih)
+# - STATUS Struktur Organisasi (TERISI / VACANT)
+# ==========================================
+
+import pandas as pd
+
+# ==============================================================
+#                    KONSTANTA
+# ==============================================================
+ALL_UNITS = "Semua Unit"
+ALL_BAGIAN = "Semua Bagian"
+
+UNIT_CANDIDATES = ["Personel Subarea", "Personnel Subarea", "Personel Area", "Unit Kerja"]
+EG_CANDIDATES = ["Employee Group", "Kategori", "EmployeeGroup"]
+JENIS_KT_CANDIDATES = ["JENIS KARYAWAN TIDAK TETAP", "Jenis Karyawan Tidak Tetap"]
+JG11_CANDIDATES = ["JOB GRADE 11", "JOB GRADE", "JG 11"]
+GENDER_CANDIDATES = ["Gender Key", "Gender", "Jenis Kelamin"]
+AGE_CANDIDATES = ["Age of employee", "Age", "Usia"]
+PN_CANDIDATES = ["Pers.No.", "PN", "Pers No", "PersNo", "Personnel Number", "Personel Number"]
+NAME_CANDIDATES = ["Personnel Number", "Nama Karyawan", "Name", "Nama"]
+POSITION_CANDIDATES = ["Position", "Jabatan", "Job Title"]
+BIRTH_DATE_CANDIDATES = ["Birth date", "Tanggal Lahir", "Birthdate", "DOB"]
+GRADE_CANDIDATES = ["ESgrp", "Person Grade", "PG"]
+BOD_CANDIDATES = ["Job Group Short (New)", "BOD Level", "BOD"]
+
+AGE_BINS = [0, 24, 30, 40, 50, 55, 200]
+AGE_LABELS = ["<24 Tahun", "25 - 30 Tahun", "31 - 40 Tahun", "41 - 50 Tahun", "51 - 55 Tahun", ">55 Tahun"]
+
+# Kolom Struktur Organisasi / Database Vacant
+ORG_UNIT_CANDIDATES = ["Unit Kerja", "UNIT KERJA", "Unit", "UNIT"]
+ORG_BAGIAN_CANDIDATES = ["BAGIAN", "DEPARTMENT", "DEPT", "Bagian"]
+ORG_JABATAN_CANDIDATES = ["JABATAN", "Jabatan", "Position"]
+ORG_PN_CANDIDATES = ["PN", "Pers.No.", "Personnel Number", "NIK", "NIK SAP"]
+ORG_NAME_CANDIDATES = ["NAMA", "Nama", "Name"]
+
+STATUS_TERISI = "🟢 TERISI"
+STATUS_VACANT_DB = "🔴 VACANT (DB)"
+STATUS_VACANT = "🔴 VACANT"
+
+# Nilai yang dianggap "negatif/kosong"
+NEG_VALUES = {"", "nan", "none", "null", "-", "0"}
+DISABILITY_NEG_VALUES = {"", "nan", "tidak ada", "tidak", "none", "no", "0"}
+
+
+# 🧰 Utilitas Umum
+# -----------------------------
+def pick_col(cols, candidates):
+    """Ambil nama kolom yang cocok (case-insensitive) dari kandidat."""
+    lut = {c.upper(): c for c in cols}
+    for cand in candidates:
+        if cand.upper() in lut:
+            return lut[cand.upper()]
+    return None
+
+
+def norm_str(x: object) -> str:
+    """Normalisasi nilai sel menjadi string tanpa spasi tepi."""
+    try:
+        s = str(x).strip()
+    except Exception:
+        return ""
+    return s
+
+
+def detect_core_columns(df: pd.DataFrame):
+    """Deteksi kolom wajib (Unit, Employee Group) pada database utama."""
+    unit_col = pick_col(df.columns, UNIT_CANDIDATES)
+    eg_col = pick_col(df.columns, EG_CANDIDATES)
+    return unit_col, eg_col
+
+
+def list_units(df: pd.DataFrame, unit_col: str) -> list:
+    """Daftar unit kerja (terurut) yang ada di database utama."""
+    return sorted(df[unit_col].dropna().astype(str).unique().tolist())
+
+
+def filter_unit(df: pd.DataFrame, unit_col: str, unit: str):
+    """Filter data per unit. Mengembalikan (df_filtered, display_unit)."""
+    if unit == ALL_UNITS:
+        return df.copy(), "Semua Unit Kerja"
+    return df[df[unit_col].astype(str) == unit].copy(), unit
+
+
+# -----------------------------
+# 📋 Rekap Kategori
+# -----------------------------
+def compute_group_counts(df_filtered: pd.DataFrame, eg_col: str) -> pd.DataFrame:
+    """Jumlah karyawan per Employee Group (+ Approved Job Grade 11)."""
+    count_by_group = df_filtered[eg_col].value_counts(dropna=False).reset_index()
+    count_by_group.columns = ["Employee Group", "Jumlah"]
+    count_by_group = count_by_group.sort_values("Jumlah", ascending=False)
+
+    # Hitung Job Grade 11 (non-NaN dianggap approved)
+    jg11_col = pick_col(df_filtered.columns, JG11_CANDIDATES)
+    if jg11_col:
+        approved_series = df_filtered[df_filtered[jg11_col].notna()][eg_col].value_counts()
+        count_by_group["Approved_JG11"] = count_by_group["Employee Group"].map(approved_series).fillna(0).astype(int)
+    else:
+        count_by_group["Approved_JG11"] = 0
+    return count_by_group
+
+
+def _jenis_tidak_tetap_counts(df_filtered: pd.DataFrame, eg_col: str, jenis_kt_col: str, group: str) -> pd.Series:
+    mask = df_filtered[eg_col] == group
+    if mask.sum() == 0:
+        return pd.Series(dtype=int)
+    series = df_filtered[mask][jenis_kt_col].dropna().astype(str).str.strip()
+    series = series[series != ""]
+    return series.value_counts()
+
+
+def compute_category_summary(df_filtered: pd.DataFrame, eg_col: str) -> dict:
+    """Summary kategori tetap + breakdown Karpel/Karpim Tidak Tetap per jenis."""
+    jenis_kt_col = pick_col(df_filtered.columns, JENIS_KT_CANDIDATES)
+    summary_data = []
+
+    karpel_tetap_count = int((df_filtered[eg_col] == "Karpel - Tetap").sum())
+    if karpel_tetap_count > 0:
+        summary_data.append({"Kategori": "Karpel - Tetap", "Jumlah": karpel_tetap_count})
+
+    karpim_tetap_count = int((df_filtered[eg_col] == "Karpim - Tetap").sum())
+    if karpim_tetap_count > 0:
+        summary_data.append({"Kategori": "Karpim - Tetap", "Jumlah": karpim_tetap_count})
+
+    # Breakdown jenis Tidak Tetap (Karpel dulu, lalu Karpim)
+    if jenis_kt_col:
+        for prefix, group in (("Karpel", "Karpel - Tidak Tetap"), ("Karpim", "Karpim - Tidak Tetap")):
+            for jenis, count in _jenis_tidak_tetap_counts(df_filtered, eg_col, jenis_kt_col, group).items():
+                summary_data.append({"Kategori": f"{prefix} - TT: {jenis}", "Jumlah": int(count)})
+
+    if summary_data:
+        summary_df = pd.DataFrame(summary_data)
+        total_kategori = int(summary_df["Jumlah"].sum())
+        total_tetap = karpel_tetap_count + karpim_tetap_count
+        total_tidak_tetap = total_kategori - total_tetap
+    else:
+        summary_df = pd.DataFrame(columns=["Kategori", "Jumlah"])
+        total_kategori = 0
+        total_tetap = 0
+        total_tidak_tetap = 0
+
+    return {
+        "summary": summary_df,
+        "total_kategori": total_kategori,
+        "total_tetap": total_tetap,
+        "total_tidak_tetap": total_tidak_tetap,
+    }
+
+
+def order_summary(df_src: pd.DataFrame, enable_custom: bool) -> pd.DataFrame:
+    """Urutkan summary; opsi kustom menaruh Karpim/Karpel Tetap paling atas."""
+    if df_src.empty:
+        return df_src
+    if enable_custom:
+        def get_priority(kat: str) -> int:
+            kat_norm = str(kat).strip().lower()
+            if kat_norm == "karpim - tetap":
+                return 0
+            if kat_norm == "karpel - tetap":
+                return 1
+            return 2  # lainnya di bawah
+        df_out = df_src.copy()
+        df_out["__priority__"] = df_out["Kategori"].apply(get_priority)
+        df_out = df_out.sort_values(by=["__priority__", "Jumlah"], ascending=[True, False]).reset_index(drop=True)
+        return df_out
+    else:
+        return df_src.sort_values(by="Jumlah", ascending=False).reset_index(drop=True)
+
+
+# -----------------------------
+# 👥 Demografi
+# -----------------------------
+def compute_gender(df_filtered: pd.DataFrame) -> dict:
+    """Jumlah Laki-laki / Perempuan / lainnya (normalisasi variasi input)."""
+    male_count = female_count = other_gender = 0
+    gender_col = pick_col(df_filtered.columns, GENDER_CANDIDATES)
+    if gender_col:
+        gender_series = (
+            df_filtered[gender_col]
+            .fillna("unknown")
+            .astype(str)
+            .str.strip()
+            .str.lower()
+        )
+        is_male = gender_series.isin(["male", "m", "l"])
+        is_female = gender_series.isin(["female", "f", "p"])
+
+        male_count = int(is_male.sum())
+        female_count = int(is_female.sum())
+        other_gender = int(len(gender_series) - male_count - female_count)
+    return {"male": male_count, "female": female_count, "other": other_gender}
+
+
+def compute_disability(df_filtered: pd.DataFrame) -> int:
+    """Jumlah orang (row) yang PUNYA disabilitas di salah satu kolom disabilitas."""
+    disability_cols = [c for c in df_filtered.columns if ("disabilitas" in c.lower() or "disability" in c.lower())]
+    if not disability_cols:
+        return 0
+    norm = (
+        df_filtered[disability_cols]
+        .astype(str)
+        .apply(lambda s: s.str.strip().str.lower())
+    )
+    has_disability_any = ~norm.isin(DISABILITY_NEG_VALUES)
+    # Agar tidak double count per orang
+    return int(has_disability_any.any(axis=1).sum())
+
+
+def compute_age_counts(df_filtered: pd.DataFrame) -> pd.Series:
+    """Jumlah karyawan per kelompok usia (index = AGE_LABELS)."""
+    age_col = pick_col(df_filtered.columns, AGE_CANDIDATES)
+    if not age_col:
+        return pd.Series([0] * len(AGE_LABELS), index=AGE_LABELS)
+    ages = pd.to_numeric(df_filtered[age_col], errors="coerce")
+    age_groups = pd.cut(ages, bins=AGE_BINS, labels=AGE_LABELS, include_lowest=True, right=True)
+    return age_groups.value_counts().reindex(AGE_LABELS).fillna(0).astype(int)
+
+
+# -----------------------------
+# 👥 Daftar Karyawan
+# -----------------------------
+def build_employee_table(df_filtered: pd.DataFrame, unit_col: str):
+    """Tabel karyawan (kolom terpilih, nama tampilan). None jika kolom tidak ada."""
+    age_col = pick_col(df_filtered.columns, AGE_CANDIDATES)
+    gender_col = pick_col(df_filtered.columns, GENDER_CANDIDATES)
+    employee_columns_candidates = [
+        ("Pers.No.", PN_CANDIDATES),
+        ("Personnel Number", NAME_CANDIDATES),
+        ("Position", POSITION_CANDIDATES),
+        (unit_col, [unit_col]),
+        ("Birth date", BIRTH_DATE_CANDIDATES),
+        (age_col if age_col else "Age of employee", [age_col if age_col else "Age of employee"]),
+        (gender_col if gender_col else "Gender Key", [gender_col if gender_col else "Gender Key"]),
+        ("ESgrp", GRADE_CANDIDATES),
+        ("Job Group Short (New)", BOD_CANDIDATES),
+    ]
+
+    available_columns = []
+    for display_name, candidates in employee_columns_candidates:
+        c = pick_col(df_filtered.columns, candidates)
+        if c:
+            available_columns.append(c)
+    if not available_columns:
+        return None
+
+    employee_df = df_filtered[available_columns].copy()
+
+    # Format tanggal lahir
+    bd_col = pick_col(employee_df.columns, BIRTH_DATE_CANDIDATES)
+    if bd_col:
+        employee_df[bd_col] = pd.to_datetime(employee_df[bd_col], errors="coerce").dt.strftime("%d/%m/%Y")
+
+    # Convert ke string untuk stabilitas render
+    for col in employee_df.columns:
+        employee_df[col] = employee_df[col].astype(str)
+
+    # Mapping nama tampilan
+    column_display_names = {
+        pick_col(employee_df.columns, ["Pers.No.", "PN", "Pers No", "PersNo"]): "NIK SAP",
+        pick_col(employee_df.columns, NAME_CANDIDATES): "Nama Karyawan",
+        pick_col(employee_df.columns, POSITION_CANDIDATES): "Jabatan",
+        unit_col: "Unit Kerja",
+        bd_col: "TGL LAHIR",
+        (age_col if age_col else pick_col(employee_df.columns, AGE_CANDIDATES)): "Usia",
+        (gender_col if gender_col else pick_col(employee_df.columns, GENDER_CANDIDATES)): "Jenis Kelamin",
+        pick_col(employee_df.columns, GRADE_CANDIDATES): "Person Grade",
+        pick_col(employee_df.columns, BOD_CANDIDATES): "BOD Level",
+    }
+    column_display_names = {k: v for k, v in column_display_names.items() if k}
+    return employee_df.rename(columns=column_display_names)
+
+
+# -----------------------------
+# 📊 Laporan per Unit
+# -----------------------------
+def build_unit_report(df: pd.DataFrame, unit: str = ALL_UNITS, unit_col=None, eg_col=None) -> dict:
+    """Rekap lengkap (kategori, demografi, usia) untuk satu unit atau Semua Unit."""
+    if not unit_col or not eg_col:
+        detected_unit, detected_eg = detect_core_columns(df)
+        unit_col = unit_col or detected_unit
+        eg_col = eg_col or detected_eg
+    if not unit_col or not eg_col:
+        raise ValueError("Kolom wajib tidak ditemukan: Unit / Employee Group.")
+
+    df_filtered, display_unit = filter_unit(df, unit_col, unit)
+    return summarize_filtered(df_filtered, eg_col, unit, display_unit)
+
+
+def summarize_filtered(df_filtered: pd.DataFrame, eg_col: str, unit: str, display_unit: str) -> dict:
+    """Rekap dari data yang sudah difilter per unit (lihat build_unit_report)."""
+    summary = compute_category_summary(df_filtered, eg_col)
+    return {
+        "unit": unit,
+        "display_unit": display_unit,
+        "total_karyawan": int(len(df_filtered)),
+        "total_tetap": summary["total_tetap"],
+        "total_tidak_tetap": summary["total_tidak_tetap"],
+        "total_kategori": summary["total_kategori"],
+        "num_kategori": int(len(summary["summary"])),
+        "summary": summary["summary"],
+        "count_by_group": compute_group_counts(df_filtered, eg_col),
+        "gender": compute_gender(df_filtered),
+        "disability": compute_disability(df_filtered),
+        "age_counts": compute_age_counts(df_filtered),
+    }
+
+
+def report_to_dict(report: dict) -> dict:
+    """Ubah report (berisi DataFrame/Series) menjadi dict yang JSON-serializable."""
+    count_by_group = report["count_by_group"].copy()
+    count_by_group["Employee Group"] = count_by_group["Employee Group"].astype(object).where(
+        count_by_group["Employee Group"].notna(), None
+    )
+    return {
+        "unit": report["unit"],
+        "display_unit": report["display_unit"],
+        "total_karyawan": report["total_karyawan"],
+        "total_tetap": report["total_tetap"],
+        "total_tidak_tetap": report["total_tidak_tetap"],
+        "total_kategori": report["total_kategori"],
+        "num_kategori": report["num_kategori"],
+        "summary": [
+            {"Kategori": str(k), "Jumlah": int(j)}
+            for k, j in zip(report["summary"]["Kategori"], report["summary"]["Jumlah"])
+        ],
+        "count_by_group": [
+            {"Employee Group": g, "Jumlah": int(j), "Approved_JG11": int(a)}
+            for g, j, a in zip(count_by_group["Employee Group"], count_by_group["Jumlah"], count_by_group["Approved_JG11"])
+        ],
+        "gender": dict(report["gender"]),
+        "disability": int(report["disability"]),
+        "age_counts": {str(k): int(v) for k, v in report["age_counts"].items()},
+    }
+
+
+def report_from_dict(data: dict) -> dict:
+    """Kebalikan report_to_dict: bangun ulang DataFrame/Series untuk ditampilkan."""
+    report = dict(data)
+    report["summary"] = pd.DataFrame(data["summary"], columns=["Kategori", "Jumlah"])
+    report["count_by_group"] = pd.DataFrame(data["count_by_group"], columns=["Employee Group", "Jumlah", "Approved_JG11"])
+    report["age_counts"] = pd.Series(
+        [int(data["age_counts"].get(label, 0)) for label in AGE_LABELS], index=AGE_LABELS
+    )
+    return report
+
+
+# -----------------------------
+# 🏛️ Struktur Organisasi & Vacant
+# -----------------------------
+def split_org_sheets(org_sheets: dict):
+    """Ambil (org_df, vacant_df) dari dict sheet. (None, None) jika sheet tidak lengkap."""
+    sheets_lower = {s.lower(): s for s in org_sheets.keys()}
+    if "struktur organisasi" in sheets_lower and "database vacant" in sheets_lower:
+        return (
+            org_sheets[sheets_lower["struktur organisasi"]].copy(),
+            org_sheets[sheets_lower["database vacant"]].copy(),
+        )
+    return None, None
+
+
+def list_org_units(org_df: pd.DataFrame) -> list:
+    """Daftar Unit Kerja pada sheet Struktur Organisasi."""
+    u_col_org = pick_col(org_df.columns, ORG_UNIT_CANDIDATES)
+    return sorted(org_df[u_col_org].dropna().unique().tolist()) if u_col_org else []
+
+
+def filter_org_unit(org_df: pd.DataFrame, sel_org_unit):
+    """Filter Struktur Organisasi berdasarkan Unit Kerja."""
+    u_col_org = pick_col(org_df.columns, ORG_UNIT_CANDIDATES)
+    if u_col_org and sel_org_unit:
+        return org_df[org_df[u_col_org].astype(str) == sel_org_unit].copy()
+    return org_df.copy()
+
+
+def list_org_bagian(temp_df: pd.DataFrame):
+    """Daftar Bagian (dengan opsi Semua Bagian). None jika kolom Bagian tidak ada."""
+    b_col_org = pick_col(temp_df.columns, ORG_BAGIAN_CANDIDATES)
+    if not b_col_org:
+        return None
+    return [ALL_BAGIAN] + sorted(temp_df[b_col_org].dropna().unique().tolist())
+
+
+def has_valid_pn(value) -> bool:
+    """PN valid: tidak kosong & (jika numerik) > 0. PN alfanumerik dianggap valid."""
+    if value is None:
+        return False
+    s = norm_str(value).lower()
+    if s in NEG_VALUES:
+        return False
+    try:
+        # Tangani string numerik dengan koma/titik (contoh: 12345.0)
+        f = float(s.replace(",", "").replace(" ", ""))
+        return f > 0
+    except Exception:
+        return True
+
+
+def compute_org_status(org_df: pd.DataFrame, vacant_df: pd.DataFrame, sel_org_unit=None, sel_bagian=None) -> pd.DataFrame:
+    """Struktur Organisasi terfilter (Unit/Bagian) + kolom STATUS TERISI/VACANT."""
+    temp_df = filter_org_unit(org_df, sel_org_unit)
+
+    b_col_org = pick_col(temp_df.columns, ORG_BAGIAN_CANDIDATES)
+    final_org_df = temp_df.copy()
+    if b_col_org and sel_bagian and sel_bagian != ALL_BAGIAN:
+        final_org_df = temp_df[temp_df[b_col_org].astype(str) == sel_bagian]
+
+    pn_col = pick_col(final_org_df.columns, ORG_PN_CANDIDATES)
+    nama_col = pick_col(final_org_df.columns, ORG_NAME_CANDIDATES)
+    jab_col = pick_col(final_org_df.columns, ORG_JABATAN_CANDIDATES)
+
+    # Siapkan set jabatan VACANT terfilter berdasarkan Unit/Bagian yang dipilih
+    u_col_vac = pick_col(vacant_df.columns, ORG_UNIT_CANDIDATES)
+    b_col_vac = pick_col(vacant_df.columns, ORG_BAGIAN_CANDIDATES)
+    jab_vac_col = pick_col(vacant_df.columns, ORG_JABATAN_CANDIDATES)
+    if jab_vac_col:
+        vac_df_filtered = vacant_df
+        if u_col_vac and sel_org_unit:
+            vac_df_filtered = vac_df_filtered[vac_df_filtered[u_col_vac].astype(str) == sel_org_unit]
+        if b_col_vac and b_col_org and sel_bagian and sel_bagian != ALL_BAGIAN:
+            vac_df_filtered = vac_df_filtered[vac_df_filtered[b_col_vac].astype(str) == sel_bagian]
+        vacant_set = set(vac_df_filtered[jab_vac_col].dropna().astype(str).str.strip().str.upper().tolist())
+    else:
+        vacant_set = set()
+
+    def check_status(row) -> str:
+        # 1) PN valid / Nama terisi → TERISI (prioritas tertinggi)
+        if (pn_col and has_valid_pn(row.get(pn_col, None))) or (
+            nama_col and norm_str(row.get(nama_col, "")).lower() not in NEG_VALUES
+        ):
+            return STATUS_TERISI
+        # 2) Cek apakah jabatan ini tercantum VACANT pada unit/bagian ini
+        jv = norm_str(row.get(jab_col, "")).upper() if jab_col else ""
+        if jv and jv in vacant_set:
+            return STATUS_VACANT_DB
+        # 3) Default: VACANT
+        return STATUS_VACANT
+
+    final_org_df = final_org_df.copy()
+    if final_org_df.empty:
+        final_org_df["STATUS"] = pd.Series(dtype=object)
+    else:
+        final_org_df["STATUS"] = final_org_df.apply(check_status, axis=1)
+    return final_org_df
+
+
+def org_status_counts(final_org_df: pd.DataFrame) -> dict:
+    """Total posisi, terisi, dan vacant dari hasil compute_org_status."""
+    status = final_org_df["STATUS"].astype(str)
+    return {
+        "total_posisi": int(len(final_org_df)),
+        "terisi": int((status == STATUS_TERISI).sum()),
+        "vacant": int(status.str.contains("🔴").sum()),
+    }
+
+
+def build_org_reports(org_sheets: dict) -> dict:
+    """Jumlah posisi/terisi/vacant per Unit Kerja Struktur Organisasi (Semua Bagian)."""
+    org_df, vacant_df = split_org_sheets(org_sheets)
+    if org_df is None:
+        return {}
+    return {
+        str(u): org_status_counts(compute_org_status(org_df, vacant_df, u, ALL_BAGIAN))
+        for u in list_org_units(org_df)
+    }
+
+
+# -----------------------------
+# 📤 Tabel datar untuk ekspor CSV / XLSX
+# -----------------------------
+def reports_to_tables(reports: dict, org_reports=None) -> dict:
+    """Ubah kumpulan report per unit menjadi tabel datar {nama_tabel: DataFrame}."""
+    rekap_rows, summary_rows, group_rows, usia_rows = [], [], [], []
+    for unit, report in reports.items():
+        rep = report if isinstance(report["summary"], list) else report_to_dict(report)
+        rekap_rows.append({
+            "Unit": unit,
+            "Total Karyawan": rep["total_karyawan"],
+            "Karyawan Tetap": rep["total_tetap"],
+            "Karyawan Tidak Tetap": rep["total_tidak_tetap"],
+            "Jumlah Kategori": rep["num_kategori"],
+            "Laki-laki": rep["gender"]["male"],
+            "Perempuan": rep["gender"]["female"],
+            "Gender Lainnya": rep["gender"]["other"],
+            "Disabilitas": rep["disability"],
+        })
+        summary_rows += [{"Unit": unit, **row} for row in rep["summary"]]
+        group_rows += [{"Unit": unit, **row} for row in rep["count_by_group"]]
+        usia_rows += [{"Unit": unit, "Kelompok Usia": k, "Jumlah": v} for k, v in rep["age_counts"].items()]
+
+    tables = {
+        "rekap": pd.DataFrame(rekap_rows),
+        "kategori": pd.DataFrame(summary_rows, columns=["Unit", "Kategori", "Jumlah"]),
+        "employee_group": pd.DataFrame(group_rows, columns=["Unit", "Employee Group", "Jumlah", "Approved_JG11"]),
+        "usia": pd.DataFrame(usia_rows, columns=["Unit", "Kelompok Usia", "Jumlah"]),
+    }
+    if org_reports:
+        tables["struktur_organisasi"] = pd.DataFrame(
+            [{"Unit Kerja": u, **counts} for u, counts in org_reports.items()],
+            columns=["Unit Kerja", "total_posisi", "terisi", "vacant"],
+        )
+    return tables
@@ -0,0 +1,453 @@
+# rekap_loader.py
+# ==========================================
+# 📦 Loader Workbook (tanpa Streamlit)
+# Baca database utama & Struktur Organisasi dari file lokal atau URL remote.
+# Semua fungsi load_* mengembalikan tuple (hasil, error) seperti di streamlit_app.py.
+# ==========================================
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+import requests
+
+ORG_HEADER_KEYWORDS = ["PN", "NAMA", "NO", "JABATAN", "UNIT", "LEVEL"]
+HASH_CHUNK_SIZE = 1 << 20
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Dataset:
+    """Database utama + Struktur Organisasi yang sudah di-parse, beserta versinya."""
+    employees: pd.DataFrame
+    org_sheets: dict = field(default_factory=dict)
+    version: str = ""
+    org_error: str = None
+
+
+def content_hash(content: bytes) -> str:
+    """Hash isi workbook (sha256, hex) sebagai identitas versi data."""
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass(frozen=True)
+class FileIdentity:
+    """Identitas file lokal: path absolut, mtime (ns), ukuran, dan hash isi."""
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+
+
+# Memo hash per path: {path: (mtime_ns, size, sha256)}. File hanya di-hash ulang
+# bila mtime/ukuran berubah, jadi cek identitas tiap rerun cukup satu os.stat().
+_HASH_MEMO = {}
+_HASH_MEMO_LOCK = threading.Lock()
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_identity(path):
+    """FileIdentity untuk file lokal, atau None jika file tidak ada."""
+    if not path or is_remote(path):
+        return None
+    abs_path = os.path.abspath(path)
+    try:
+        stat = os.stat(abs_path)
+    except OSError:
+        return None
+    with _HASH_MEMO_LOCK:
+        memo = _HASH_MEMO.get(abs_path)
+    if memo and memo[:2] == (stat.st_mtime_ns, stat.st_size):
+        sha = memo[2]
+    else:
+        try:
+            sha = _hash_file(abs_path)
+        except OSError:
+            return None
+        with _HASH_MEMO_LOCK:
+            _HASH_MEMO[abs_path] = (stat.st_mtime_ns, stat.st_size, sha)
+    return FileIdentity(abs_path, stat.st_mtime_ns, stat.st_size, sha)
+
+
+def write_workbook(path, content: bytes) -> FileIdentity:
+    """Tulis workbook secara atomik (tmp + rename) dan catat hash-nya di memo.
+
+    Pemanggil sudah memegang bytes-nya, jadi file tidak perlu dibaca/di-hash ulang.
+    """
+    abs_path = os.path.abspath(path)
+    tmp_path = f"{abs_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, abs_path)
+    stat = os.stat(abs_path)
+    sha = content_hash(content)
+    with _HASH_MEMO_LOCK:
+        _HASH_MEMO[abs_path] = (stat.st_mtime_ns, stat.st_size, sha)
+    return FileIdentity(abs_path, stat.st_mtime_ns, stat.st_size, sha)
+
+
+def is_remote(url_or_path) -> bool:
+    return bool(url_or_path) and str(url_or_path).startswith("http")
+
+
+def resolve_source(local_file, url):
+    """Pakai file lokal jika ada, selain itu URL remote."""
+    return local_file if local_file and Path(local_file).exists() else url
+
+
+def read_source_bytes(url_or_path, timeout=60) -> bytes:
+    """Ambil isi workbook (bytes) dari path lokal atau URL. Raise jika gagal."""
+    local_path = Path(url_or_path) if url_or_path and not is_remote(url_or_path) else None
+    if local_path and local_path.exists():
+        return local_path.read_bytes()
+    if is_remote(url_or_path):
+        r = requests.get(url_or_path, timeout=timeout)
+        r.raise_for_status()
+        return r.content
+    raise FileNotFoundError("File tidak ditemukan (lokal maupun remote)")
+
+
+def _tag_version(df, version: str):
+    if isinstance(df, pd.DataFrame):
+        df.attrs["content_hash"] = version
+    return df
+
+
+def data_version(df_or_sheets) -> str:
+    """Hash isi workbook asal sebuah DataFrame / dict sheet (dicatat saat parse)."""
+    if isinstance(df_or_sheets, dict):
+        return "|".join(sorted({data_version(df) for df in df_or_sheets.values()}))
+    if isinstance(df_or_sheets, pd.DataFrame):
+        return df_or_sheets.attrs.get("content_hash", "")
+    return ""
+
+
+def parse_excel_bytes(content: bytes, sheet_name=0) -> pd.DataFrame:
+    """Parse satu sheet database utama dari bytes workbook (versi dicatat di df.attrs)."""
+    return _tag_version(pd.read_excel(BytesIO(content), sheet_name=sheet_name), content_hash(content))
+
+
+def parse_org_sheets(xls: pd.ExcelFile) -> dict:
+    """Parse semua sheet Struktur Organisasi, mendeteksi baris header otomatis."""
+    sheets = {}
+    for sheet in xls.sheet_names:
+        try:
+            # baca 20 baris awal tanpa header untuk mendeteksi header
+            df_preview = xls.parse(sheet_name=sheet, header=None, nrows=20)
+            header_row = None
+            for i, row in df_preview.iterrows():
+                row_str = row.astype(str).str.strip().fillna("").str.upper()
+                if any(cell in row_str.values for cell in ORG_HEADER_KEYWORDS):
+                    header_row = i
+                    break
+            # Parse dengan header terdeteksi jika ada
+            if header_row is not None:
+                df = xls.parse(sheet_name=sheet, header=header_row)
+            else:
+                df = xls.parse(sheet_name=sheet, header=0)
+            # Drop kolom kosong penuh
+            df = df.loc[:, ~df.columns.astype(str).str.contains("^Unnamed") | df.notna().any()]
+            sheets[sheet] = df
+        except Exception:
+            try:
+                sheets[sheet] = xls.parse(sheet_name=sheet)
+            except Exception:
+                sheets[sheet] = pd.DataFrame()
+    return sheets
+
+
+def parse_org_bytes(content: bytes) -> dict:
+    """Parse workbook Struktur Organisasi dari bytes (versi dicatat di df.attrs tiap sheet)."""
+    version = content_hash(content)
+    return {sheet: _tag_version(df, version) for sheet, df in parse_org_sheets(pd.ExcelFile(BytesIO(content))).items()}
+
+
+def load_excel_data(url_or_path, sheet_name=0):
+    """Load Excel dari local path (jika ada) atau remote URL."""
+    try:
+        return parse_excel_bytes(read_source_bytes(url_or_path), sheet_name=sheet_name), None
+    except Exception as e:
+        return None, str(e)
+
+
+def load_org_sheets(url_or_path):
+    """Load semua sheet Struktur Organisasi dari local path (jika ada) atau remote URL."""
+    try:
+        return parse_org_bytes(read_source_bytes(url_or_path)), None
+    except Exception as e:
+        return None, str(e)
+
+
+def load_dataset(employee_source, org_source=None, sheet_name=0, previous=None):
+    """Load database utama (+ Struktur Organisasi bila ada) sebagai Dataset.
+
+    Versi = hash gabungan isi kedua workbook, jadi hanya berubah bila isi berubah.
+    Struktur Organisasi bersifat opsional: gagal load dicatat di org_error.
+    Dengan `previous`, workbook yang isinya tidak berubah tidak di-parse ulang dan
+    `previous` sendiri dikembalikan bila keduanya sama.
+    """
+    employees, error = load_excel_if_changed(
+        employee_source, previous.employees if previous else None, sheet_name=sheet_name
+    )
+    if error:
+        return None, error
+
+    version_parts = [data_version(employees)]
+    org_sheets, org_error = {}, None
+    if org_source:
+        org_sheets, org_error = load_org_sheets_if_changed(org_source, previous.org_sheets if previous else None)
+        if org_error:
+            org_sheets = {}
+        else:
+            version_parts.append(data_version(org_sheets))
+
+    if (
+        previous is not None
+        and employees is previous.employees
+        and org_sheets is previous.org_sheets
+        and org_error == previous.org_error
+    ):
+        return previous, None
+    version = hashlib.sha256("|".join(version_parts).encode()).hexdigest()[:16]
+    return Dataset(employees=employees, org_sheets=org_sheets, version=version, org_error=org_error), None
+
+
+def _unchanged_local_file(url_or_path, previous) -> bool:
+    """True bila file lokal masih berisi versi `previous` (cukup os.stat berkat memo hash)."""
+    if previous is None or (isinstance(previous, dict) and not previous):
+        return False
+    identity = file_identity(url_or_path)
+    return identity is not None and identity.sha256 == data_version(previous)
+
+
+def load_excel_if_changed(url_or_path, previous=None, sheet_name=0):
+    """Seperti load_excel_data, tapi tidak parse ulang bila isi sama dengan `previous`."""
+    try:
+        if _unchanged_local_file(url_or_path, previous):
+            return previous, None
+        content = read_source_bytes(url_or_path)
+        if previous is not None and data_version(previous) == content_hash(content):
+            return previous, None
+        return parse_excel_bytes(content, sheet_name=sheet_name), None
+    except Exception as e:
+        return None, str(e)
+
+
+def load_org_sheets_if_changed(url_or_path, previous=None):
+    """Seperti load_org_sheets, tapi tidak parse ulang bila isi sama dengan `previous`."""
+    try:
+        if _unchanged_local_file(url_or_path, previous):
+            return previous, None
+        content = read_source_bytes(url_or_path)
+        if previous and data_version(previous) == content_hash(content):
+            return previous, None
+        return parse_org_bytes(content), None
+    except Exception as e:
+        return None, str(e)
+
+
+# -----------------------------
+# 🚦 Single-flight + stale-while-revalidate
+# -----------------------------
+class _Entry:
+    def __init__(self):
+        self.value = None
+        self.error = None
+        self.loaded_at = None
+        self.retry_at = 0.0
+        self.inflight = None  # threading.Event selama load/refresh berjalan
+
+
+class SourceCache:
+    """Cache per sumber (URL/path) yang dibagi semua sesi dalam satu proses.
+
+    - Single-flight: per key hanya SATU load/refresh berjalan; sesi lain menunggu
+      hasil load yang sama (bila belum ada nilai) atau langsung dapat versi lama.
+    - Stale-while-revalidate: setelah TTL habis nilai lama tetap disajikan, refresh
+      berjalan di thread background.
+    - Refresh gagal tidak menghapus dataset terakhir yang valid; percobaan ulang
+      ditunda `retry_after` detik agar sumber yang bermasalah tidak dibanjiri request.
+
+    - Sesi yang menunggu load pertama dibatasi `wait_timeout` detik; load yang
+      macet tidak membuat semua sesi menggantung.
+
+    `load(key, previous)` harus mengembalikan tuple (hasil, error).
+    """
+
+    def __init__(self, load, ttl=3600, retry_after=60, clock=time.monotonic, wait_timeout=120):
+        self._load = load
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self.wait_timeout = wait_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key):
+        """(hasil, error) untuk key; error hanya bila belum pernah ada hasil yang valid."""
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry())
+            now = self._clock()
+            if entry.value is not None:
+                stale = now - entry.loaded_at >= self.ttl
+                if stale and entry.inflight is None and now >= entry.retry_at:
+                    entry.inflight = threading.Event()
+                    try:
+                        threading.Thread(
+                            target=self._run, args=(key, entry), name=f"refresh-{key}", daemon=True
+                        ).start()
+                    except RuntimeError:
+                        entry.inflight = None  # thread gagal dibuat: coba lagi di request berikutnya
+                return entry.value, None
+            if entry.inflight is None and entry.error and now < entry.retry_at:
+                # Load pertama gagal baru-baru ini: jangan ulangi sebelum retry_after
+                return None, entry.error
+            waiter = entry.inflight
+            if waiter is None:
+                entry.inflight = threading.Event()
+
+        if waiter is not None:
+            if not waiter.wait(self.wait_timeout):
+                with self._lock:
+                    if entry.value is not None:
+                        return entry.value, None
+                return None, f"Timeout menunggu load data ({self.wait_timeout} detik)"
+            with self._lock:
+                return entry.value, (None if entry.value is not None else entry.error)
+
+        self._run(key, entry)
+        with self._lock:
+            return entry.value, (None if entry.value is not None else entry.error)
+
+    def _run(self, key, entry):
+        value, error = None, None
+        try:
+            value, error = self._load(key, entry.value)
+        except Exception as e:
+            value, error = None, str(e)
+        finally:
+            # Selalu bebaskan penunggu, termasuk saat BaseException lolos dari loader
+            with self._lock:
+                now = self._clock()
+                if value is not None and not error:
+                    entry.value, entry.error, entry.loaded_at = value, None, now
+                else:
+                    # Pertahankan nilai lama; catat error & tunda percobaan berikutnya
+                    entry.error = error or "Gagal memuat data"
+                    entry.retry_at = now + self.retry_after
+                event, entry.inflight = entry.inflight, None
+            if event is not None:
+                event.set()
+
+    def last_error(self, key):
+        """Error refresh terakhir (None bila sukses / belum pernah gagal)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.error if entry else None
+
+
+# -----------------------------
+# 👀 Watcher file workbook lokal
+# -----------------------------
+class WorkbookWatcher:
+    """Pantau file workbook lokal dan panggil on_change(path, identity) saat ISI berubah.
+
+    Memakai watchdog (inotify di Linux) bila tersedia, fallback ke polling os.stat().
+    Event beruntun (mis. Excel/git menulis file bertahap) digabung lewat debounce;
+    file yang hanya di-touch (hash sama) tidak memicu on_change.
+    """
+
+    def __init__(self, paths, on_change, debounce=0.5, poll_interval=2.0):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._known = {p: file_identity(p) for p in self.paths}
+        self._timers = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._observer = None
+        self._poll_thread = None
+
+    def start(self):
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            self._poll_thread = threading.Thread(target=self._poll_loop, name="workbook-watcher", daemon=True)
+            self._poll_thread.start()
+            return self
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                for attr in ("src_path", "dest_path"):
+                    path = getattr(event, attr, None)
+                    if path and os.path.abspath(path) in watcher.paths:
+                        watcher._schedule(os.path.abspath(path))
+
+        self._observer = Observer()
+        for directory in {os.path.dirname(p) for p in self.paths}:
+            if os.path.isdir(directory):
+                self._observer.schedule(_Handler(), directory, recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+
+    def _schedule(self, path):
+        with self._lock:
+            if self._stop.is_set():
+                return
+            previous = self._timers.get(path)
+            if previous is not None:
+                previous.cancel()
+            timer = threading.Timer(self.debounce, self.check, args=(path,))
+            timer.daemon = True
+            self._timers[path] = timer
+            timer.start()
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            for path in self.paths:
+                self.check(path)
+
+    def check(self, path):
+        """Cek satu file; panggil on_change bila hash isi berbeda dari yang terakhir dilihat."""
+        identity = file_identity(path)
+        with self._lock:
+            self._timers.pop(path, None)
+            previous = self._known.get(path)
+            if identity is None or (previous is not None and previous.sha256 == identity.sha256):
+                if identity is not None:
+                    self._known[path] = identity
+                return False
+            self._known[path] = identity
+        try:
+            self.on_change(path, identity)
+        except Exception:
+            _LOGGER.exception("Gagal memproses perubahan workbook %s", path)
+        return True
@@ -0,0 +1,322 @@
+# rekap_loadtest.py
+# ==========================================
+# 🏋️ Load Test Dashboard (headless, offline)
+# Simulasi N sesi HR yang berinteraksi bersamaan dengan streamlit_app.py memakai
+# Streamlit AppTest (tanpa browser / websocket). Semua sesi berjalan di SATU proses,
+# jadi cache (st.cache_data / st.cache_resource / SourceCache) dibagi seperti di server.
+#
+# Tiap sesi menjalankan skenario realistis:
+#   buka app → ganti selected_unit → toggle urutan kustom → ganti org_u → ganti org_b
+#   → kembali ke Semua Unit  (diulang --iterations kali)
+# Laporan: latency rerun p50/p95/p99 (total & per aksi), throughput, memori proses,
+# dan statistik payload chart (cache hit, waktu serialisasi, ukuran spec).
+#
+# Contoh:
+#   python rekap_loadtest.py --sessions 50 --iterations 3
+#   python rekap_loadtest.py --sessions 10 --json loadtest.json
+#
+# Berjalan offline: workbook dibaca dari file lokal, secrets diisi nilai sintetis.
+# ==========================================
+
+import argparse
+import json
+import math
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import warnings
+from pathlib import Path
+
+APP_FILE = "streamlit_app.py"
+LOCAL_FILES = ["Cek Test Profile.xlsx", "Struktur Organisasi.xlsx"]
+
+# Secrets sintetis: cukup untuk lolos validasi DEFAULT_URL, tidak pernah dipanggil
+# karena workbook lokal selalu diprioritaskan.
+SYNTHETIC_SECRETS = {
+    "database_url": "https://example.invalid/Cek%20Test%20Profile.xlsx",
+    "repo_owner": "loadtest",
+    "repo_name": "offline",
+    "branch": "main",
+}
+
+
+# -----------------------------
+# 📈 Statistik
+# -----------------------------
+def percentile(values, pct):
+    """Persentil (nearest-rank) dari list angka; 0.0 bila kosong."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(pct / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def summarize(latencies):
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else 0.0,
+    }
+
+
+def current_rss_mb():
+    """RSS proses saat ini (MB); fallback ke peak RSS bila /proc tidak tersedia."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class MemorySampler(threading.Thread):
+    """Sampling RSS berkala selama load test."""
+
+    def __init__(self, interval=0.2):
+        super().__init__(name="rss-sampler", daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.samples.append(current_rss_mb())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# -----------------------------
+# 👤 Sesi simulasi
+# -----------------------------
+class SessionResult:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = []
+
+    def record(self, action, seconds):
+        self.latencies.setdefault(action, []).append(seconds)
+
+
+def _timed_run(at, result, action, timeout):
+    started = time.perf_counter()
+    at.run(timeout=timeout)
+    result.record(action, time.perf_counter() - started)
+    if at.exception:
+        result.errors.append(f"{action}: {at.exception[0].value}")
+
+
+_COMPILE_LOCK = threading.Lock()
+
+
+def patch_apptest_for_threads():
+    """Tambal asumsi single-thread di AppTest agar sesi paralel tidak saling ganggu.
+
+    - AppTest membuat ScriptCache baru di setiap run (server asli memakai satu cache),
+      dan ast.parse paralel di CPython 3.11 bisa gagal "AST constructor recursion
+      depth mismatch" (gh-106905) → compile script diserialkan.
+    - AppTest memasang Runtime tiruan global di awal run dan mengosongkannya di akhir
+      run → sesi lain yang masih berjalan memakai Runtime tiruan terakhir.
+    - AppTest menukar st.secrets global per run bila `at.secrets` diisi → secrets
+      sintetis dipasang global sekali, sesi tidak mengisi `at.secrets`.
+
+    PERHATIAN: tambalan ini PERMANEN untuk seluruh proses (ScriptCache.get_bytecode,
+    Runtime.instance, dan st.secrets tidak dikembalikan). Jalankan load test di proses
+    sendiri (CLI), jangan dari proses yang juga menjalankan test/aplikasi lain.
+    Idempoten.
+    """
+    import streamlit as st
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner import script_cache
+    from streamlit.runtime.secrets import Secrets
+
+    secrets = Secrets()
+    secrets._secrets = dict(SYNTHETIC_SECRETS)
+    st.secrets = secrets
+
+    original_get_bytecode = script_cache.ScriptCache.get_bytecode
+    if getattr(original_get_bytecode, "_loadtest_patched", False):
+        return
+
+    def get_bytecode(self, script_path):
+        with _COMPILE_LOCK:
+            return original_get_bytecode(self, script_path)
+
+    original_instance = Runtime.instance.__func__
+    last_runtime = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last_runtime[:] = [cls._instance]
+            return cls._instance
+        return last_runtime[0] if last_runtime else original_instance(cls)
+
+    get_bytecode._loadtest_patched = True
+    script_cache.ScriptCache.get_bytecode = get_bytecode
+    Runtime.instance = classmethod(instance)
+
+
+def selectbox_values(selectbox) -> list:
+    """Nilai asli opsi selectbox AppTest. `options` berisi label hasil format_func
+    (mis. "Unit A (2 karyawan)" di mode partisi), padahal `select` butuh nilai asli."""
+    format_func = selectbox.format_func
+    values = []
+    for label in selectbox.options:
+        candidate = label.rsplit(" (", 1)[0]
+        values.append(candidate if candidate != label and str(format_func(candidate)) == label else label)
+    return values
+
+
+def run_session(app_path, iterations, seed, timeout, start_barrier=None):
+    """Satu sesi HR: skenario interaksi diulang `iterations` kali."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    result = SessionResult()
+    at = AppTest.from_file(str(app_path), default_timeout=timeout)
+
+    if start_barrier is not None:
+        start_barrier.wait()
+    try:
+        _timed_run(at, result, "initial_load", timeout)
+        for _ in range(iterations):
+            units = selectbox_values(at.selectbox(key="selected_unit"))
+            at.selectbox(key="selected_unit").select(rng.choice(units[1:] or units))
+            _timed_run(at, result, "select_unit", timeout)
+
+            checkbox = at.checkbox(key="use_custom_order")
+            checkbox.set_value(not checkbox.value)
+            _timed_run(at, result, "toggle_order", timeout)
+
+            org_units = [sb for sb in at.selectbox if sb.key == "org_u"]
+            if org_units and org_units[0].options:
+                org_units[0].select(rng.choice(org_units[0].options))
+                _timed_run(at, result, "select_org_unit", timeout)
+
+            org_bagian = [sb for sb in at.selectbox if sb.key == "org_b"]
+            if org_bagian and org_bagian[0].options:
+                org_bagian[0].select(rng.choice(org_bagian[0].options))
+                _timed_run(at, result, "select_org_bagian", timeout)
+
+            at.selectbox(key="selected_unit").select(units[0])
+            _timed_run(at, result, "select_all_units", timeout)
+    except Exception as e:
+        result.errors.append(f"{type(e).__name__}: {e}")
+    return result
+
+
+def run_load_test(app_dir, sessions, iterations, seed=0, timeout=300):
+    """Jalankan `sessions` sesi bersamaan dan kembalikan laporan (dict)."""
+    app_dir = Path(app_dir).resolve()
+    missing = [f for f in LOCAL_FILES if not (app_dir / f).exists()]
+    if missing:
+        raise FileNotFoundError(f"Workbook lokal tidak ditemukan (load test harus offline): {missing}")
+    os.chdir(app_dir)  # streamlit_app.py membaca workbook relatif terhadap cwd
+    if str(app_dir) not in sys.path:
+        sys.path.insert(0, str(app_dir))
+    import rekap_charts  # modul yang sama dengan yang diimpor streamlit_app.py (satu proses)
+    rekap_charts.reset_stats()
+    patch_apptest_for_threads()
+
+    baseline_rss = current_rss_mb()
+    results = [None] * sessions
+    barrier = threading.Barrier(sessions)
+
+    def worker(i):
+        results[i] = run_session(app_dir / APP_FILE, iterations, seed + i, timeout, barrier)
+
+    sampler = MemorySampler()
+    sampler.start()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,), name=f"session-{i}") for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+    sampler.stop()
+
+    by_action = {}
+    for r in results:
+        for action, values in r.latencies.items():
+            by_action.setdefault(action, []).extend(values)
+    all_latencies = [v for values in by_action.values() for v in values]
+    errors = [e for r in results for e in r.errors]
+
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "wall_seconds": round(wall, 2),
+        "reruns": len(all_latencies),
+        "throughput_reruns_per_s": round(len(all_latencies) / wall, 2) if wall else 0.0,
+        "latency": summarize(all_latencies),
+        "latency_by_action": {action: summarize(values) for action, values in sorted(by_action.items())},
+        "memory_mb": {
+            "baseline_rss": round(baseline_rss, 1),
+            "peak_rss": round(max(sampler.samples + [current_rss_mb(), peak_rss_mb()]), 1),
+            "final_rss": round(current_rss_mb(), 1),
+        },
+        "charts": rekap_charts.chart_stats(),
+        "errors": errors[:20],
+        "error_count": len(errors),
+    }
+
+
+def format_report(report) -> str:
+    lines = [
+        f"👥 Sesi: {report['sessions']} × {report['iterations']} iterasi | "
+        f"{report['reruns']} rerun dalam {report['wall_seconds']} detik "
+        f"({report['throughput_reruns_per_s']} rerun/detik)",
+        "",
+        f"{'aksi':<20}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}",
+    ]
+    rows = list(report["latency_by_action"].items()) + [("TOTAL", report["latency"])]
+    for action, s in rows:
+        lines.append(f"{action:<20}{s['count']:>6}{s['p50_ms']:>10}{s['p95_ms']:>10}{s['p99_ms']:>10}{s['max_ms']:>10}")
+    if report.get("charts"):
+        lines += ["", f"{'chart':<20}{'render':>8}{'build':>7}{'hit':>7}{'build ms':>10}{'serial ms':>11}{'bytes':>8}"]
+        for chart, c in report["charts"].items():
+            lines.append(f"{chart:<20}{c['renders']:>8}{c['builds']:>7}{c['hit_rate']:>7}{c['avg_build_ms']:>10}{c['avg_serialize_ms']:>11}{c['payload_bytes']:>8}")
+    mem = report["memory_mb"]
+    lines += [
+        "",
+        f"🧠 Memori (RSS): awal {mem['baseline_rss']} MB | puncak {mem['peak_rss']} MB | akhir {mem['final_rss']} MB",
+        f"{'✅' if not report['error_count'] else '❌'} Error: {report['error_count']}",
+    ]
+    lines += [f"   - {e}" for e in report["errors"]]
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test dashboard: N sesi bersamaan via Streamlit AppTest.")
+    parser.add_argument("--sessions", type=int, default=10, help="Jumlah sesi bersamaan (default: %(default)s)")
+    parser.add_argument("--iterations", type=int, default=3, help="Pengulangan skenario per sesi (default: %(default)s)")
+    parser.add_argument("--app-dir", default=str(Path(__file__).resolve().parent), help="Folder streamlit_app.py & workbook lokal")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=300, help="Timeout per rerun (detik)")
+    parser.add_argument("--json", help="Simpan laporan lengkap ke file JSON")
+    args = parser.parse_args(argv)
+
+    # Warning pandas per rerun (mis. format tanggal) hanya membanjiri output laporan
+    warnings.filterwarnings("ignore", category=UserWarning)
+    report = run_load_test(args.app_dir, args.sessions, args.iterations, seed=args.seed, timeout=args.timeout)
+    print(format_report(report))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    return 1 if report["error_count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
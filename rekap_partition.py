@@ -0,0 +1,284 @@
+# rekap_partition.py
+# ==========================================
+# 🗂️ Dataset Terpartisi per Unit (tanpa Streamlit)
+# Pecah database utama & Struktur Organisasi per unit menjadi file terpisah, plus
+# manifest kecil (nama unit, jumlah baris, total Semua Unit yang sudah dihitung).
+# Dashboard cukup membaca manifest untuk dropdown (nama unit + jumlah karyawan), lalu
+# load HANYA partisi unit yang dipilih — memori & waktu render mengikuti ukuran unit.
+#
+# Struktur folder:
+#   <root>/manifest.json                          → menunjuk ke folder versi aktif
+#   <root>/versions/<versi>/employees/NNNN.pkl    → baris karyawan per Personnel Subarea
+#   <root>/versions/<versi>/org/NNNN.pkl          → baris Struktur Organisasi per Unit Kerja
+#   <root>/versions/<versi>/vacant/NNNN.pkl       → baris Database Vacant per Unit Kerja
+#   <root>/versions/<versi>/search.pkl            → indeks pencarian (dibangun saat partisi ditulis)
+#   <root>/versions/<versi>/manifest.json         → salinan manifest versi tsb (penanda folder lengkap)
+#
+# Versi baru ditulis ke folder sementara lalu dipindah atomik ke versions/<versi>;
+# manifest aktif ditulis atomik SETELAH itu, jadi pembaca tidak pernah melihat versi
+# setengah jadi dan folder versi yang sudah ada tidak pernah ditulis ulang. Format partisi: pickle pandas (tanpa
+# dependensi tambahan, aman untuk kolom bertipe campuran). Pembersihan versi lama
+# hanya menyentuh folder versi (16 hex) di dalam <root>/versions/.
+# ==========================================
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import rekap_engine as engine
+import rekap_loader
+import rekap_search
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_FORMAT = 2
+VERSIONS_DIR = "versions"
+SEARCH_FILE = "search.pkl"
+KEEP_VERSIONS = 2
+
+_VERSION_NAME = re.compile(r"^[0-9a-f]{16}$")
+
+REBUILD_HINT = "Jalankan ulang `python rekap_cli.py --format partitions`."
+
+# Satu build partisi dalam satu waktu per proses (upload, watcher, CLI)
+_BUILD_LOCK = threading.Lock()
+
+
+def partition_version(df: pd.DataFrame, org_sheets=None) -> str:
+    """Versi partisi = hash versi isi workbook sumber."""
+    parts = [rekap_loader.data_version(df), rekap_loader.data_version(org_sheets) if org_sheets else ""]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+def _write_groups(df: pd.DataFrame, col: str, target: Path) -> dict:
+    """Tulis satu file per nilai `col`; kembalikan {nilai: {rows, file}}."""
+    target.mkdir(parents=True, exist_ok=True)
+    entries = {}
+    keys = df[col].astype(str).where(df[col].notna(), None)
+    for i, (name, part) in enumerate(df.groupby(keys, sort=True, dropna=True)):
+        file_name = f"{i:04d}.pkl"
+        part.to_pickle(target / file_name)
+        entries[str(name)] = {"rows": int(len(part)), "file": f"{target.name}/{file_name}"}
+    return entries
+
+
+def build_partitions(df: pd.DataFrame, org_sheets: dict, root) -> dict:
+    """Tulis partisi per unit + manifest ke `root`. Mengembalikan manifest.
+
+    Build diserialisasi per proses (upload & watcher bisa memicu build bersamaan).
+    Versi baru ditulis ke folder sementara lalu dipindah atomik ke versions/<versi>,
+    jadi folder versi yang sudah ada (mungkin sedang dibaca) tidak pernah dihapus.
+    """
+    root = Path(root)
+    unit_col, eg_col = engine.detect_core_columns(df)
+    if not unit_col or not eg_col:
+        raise ValueError("Kolom wajib tidak ditemukan: Unit / Employee Group.")
+
+    version = partition_version(df, org_sheets)
+    with _BUILD_LOCK:
+        # Cek ulang SETELAH lock: build lain mungkin baru saja menulis versi yang sama
+        current = _active_manifest(root)
+        if current is not None and current["version"] == version:
+            return current  # isi sumber sama → partisi tidak perlu ditulis ulang
+
+        version_dir = root / VERSIONS_DIR / version
+        manifest = _read_json(version_dir / MANIFEST_FILE)
+        if manifest is None or manifest.get("format") != MANIFEST_FORMAT:
+            manifest = _write_version(df, org_sheets, root, version, unit_col, eg_col)
+        _write_json_atomic(root / MANIFEST_FILE, manifest)
+        _prune_versions(root, keep=version)
+        return manifest
+
+
+def _write_version(df, org_sheets, root: Path, version: str, unit_col: str, eg_col: str) -> dict:
+    """Tulis satu versi lengkap ke folder sementara, lalu pindahkan ke versions/<versi>."""
+    version_rel = f"{VERSIONS_DIR}/{version}"
+    version_dir = root / VERSIONS_DIR / version
+    tmp_dir = root / VERSIONS_DIR / f".tmp-{version}-{os.getpid()}-{threading.get_ident()}"
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+    try:
+        manifest = _write_version_files(df, org_sheets, tmp_dir, version, version_rel, unit_col, eg_col)
+        # Manifest per versi ditulis terakhir: folder versi yang punya manifest = lengkap
+        _write_json_atomic(tmp_dir / MANIFEST_FILE, manifest)
+        if version_dir.exists() and _read_json(version_dir / MANIFEST_FILE) is None:
+            # Sisa build lama yang tidak lengkap (manifest aktif tidak menunjuk ke sini)
+            shutil.rmtree(version_dir, ignore_errors=True)
+        try:
+            os.replace(tmp_dir, version_dir)
+        except OSError:
+            # Proses lain lebih dulu memindahkan versi yang sama → pakai milik mereka
+            existing = _read_json(version_dir / MANIFEST_FILE)
+            if existing is None:
+                raise
+            manifest = existing
+    finally:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return manifest
+
+
+def _write_version_files(df, org_sheets, target: Path, version: str, version_rel: str, unit_col: str, eg_col: str) -> dict:
+    """Tulis partisi + indeks pencarian ke `target`; path di manifest memakai `version_rel`."""
+    employees = _write_groups(df, unit_col, target / "employees")
+    for name in employees:
+        employees[name]["file"] = f"{version_rel}/{employees[name]['file']}"
+
+    # Struktur Organisasi hanya dipartisi bila punya kolom Unit Kerja; selain itu
+    # dashboard memakai loader biasa untuk section Struktur Organisasi.
+    org = None
+    org_df, vacant_df = engine.split_org_sheets(org_sheets) if org_sheets else (None, None)
+    u_col_org = engine.pick_col(org_df.columns, engine.ORG_UNIT_CANDIDATES) if org_df is not None else None
+    if u_col_org:
+        org_units = _write_groups(org_df, u_col_org, target / "org")
+        u_col_vac = engine.pick_col(vacant_df.columns, engine.ORG_UNIT_CANDIDATES)
+        vacant_dir = target / "vacant"
+        vacant_dir.mkdir(parents=True, exist_ok=True)
+        if u_col_vac:
+            vacant_units = _write_groups(vacant_df, u_col_vac, vacant_dir)
+            vacant_df.iloc[0:0].to_pickle(vacant_dir / "empty.pkl")
+        else:
+            # Tanpa kolom Unit, Database Vacant berlaku untuk semua unit → satu file bersama
+            vacant_units = {}
+            vacant_df.to_pickle(vacant_dir / "all.pkl")
+        fallback_vacant = f"{version_rel}/vacant/{'empty' if u_col_vac else 'all'}.pkl"
+        org = {
+            "units": {
+                name: {
+                    "rows": entry["rows"],
+                    "file": f"{version_rel}/{entry['file']}",
+                    "vacant_file": f"{version_rel}/{vacant_units[name]['file']}" if name in vacant_units else fallback_vacant,
+                }
+                for name, entry in org_units.items()
+            },
+        }
+
+    # Indeks pencarian dibangun sekarang dari frame utuh yang sudah ada di memori,
+    # jadi dashboard tidak perlu menggabungkan semua partisi saat runtime.
+    search_index = rekap_search.EmployeeSearchIndex(df, org_df, version=version)
+    with open(target / SEARCH_FILE, "wb") as f:
+        pickle.dump(search_index, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return {
+        "format": MANIFEST_FORMAT,
+        "version": version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "unit_col": unit_col,
+        "eg_col": eg_col,
+        "units": employees,
+        "totals": engine.report_to_dict(engine.build_unit_report(df, engine.ALL_UNITS, unit_col, eg_col)),
+        "org": org,
+        "search_file": f"{version_rel}/{SEARCH_FILE}",
+    }
+
+
+def _active_manifest(root: Path):
+    """Manifest aktif di `root`, atau None bila belum ada / format lama (→ tulis ulang)."""
+    manifest = _read_json(root / MANIFEST_FILE)
+    if manifest is None or manifest.get("format") != MANIFEST_FORMAT:
+        return None
+    return manifest
+
+
+def _read_json(path: Path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json_atomic(path: Path, data: dict):
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _prune_versions(root: Path, keep: str):
+    """Hapus folder versi lama di <root>/versions; sisakan versi aktif + KEEP_VERSIONS-1 terbaru.
+
+    Hanya folder bernama versi (16 hex) yang disentuh; isi lain folder output aman.
+    """
+    dirs = sorted(
+        (p for p in (root / VERSIONS_DIR).iterdir() if p.is_dir() and p.name != keep and _VERSION_NAME.match(p.name)),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    )
+    for old in dirs[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+class PartitionedDataset:
+    """Pembaca dataset terpartisi: manifest di-load sekali, partisi dibaca on-demand."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.manifest = json.loads((self.root / MANIFEST_FILE).read_text(encoding="utf-8"))
+        if self.manifest.get("format") != MANIFEST_FORMAT:
+            raise ValueError(f"Format manifest tidak didukung: {self.manifest.get('format')}. {REBUILD_HINT}")
+
+    @staticmethod
+    def exists(root) -> bool:
+        return bool(root) and (Path(root) / MANIFEST_FILE).exists()
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    @property
+    def unit_col(self) -> str:
+        return self.manifest["unit_col"]
+
+    @property
+    def eg_col(self) -> str:
+        return self.manifest["eg_col"]
+
+    @property
+    def units(self) -> list:
+        return sorted(self.manifest["units"])
+
+    def unit_rows(self, unit) -> int:
+        """Jumlah karyawan satu unit (dari manifest, tanpa load partisi)."""
+        return self.manifest["units"].get(unit, {}).get("rows", 0)
+
+    def totals(self) -> dict:
+        """Report Semua Unit yang sudah dihitung saat partisi dibuat."""
+        return engine.report_from_dict(self.manifest["totals"])
+
+    def load_unit(self, unit) -> pd.DataFrame:
+        """Baris karyawan satu unit. KeyError bila unit tidak ada di manifest."""
+        entry = self.manifest["units"].get(unit)
+        if entry is None:
+            raise KeyError(f"Unit tidak ditemukan di partisi: {unit}")
+        return pd.read_pickle(self.root / entry["file"])
+
+    # --- Struktur Organisasi ---
+    @property
+    def has_org(self) -> bool:
+        return bool((self.manifest.get("org") or {}).get("units"))
+
+    @property
+    def org_units(self) -> list:
+        org = self.manifest.get("org") or {}
+        return sorted(org.get("units", {}))
+
+    def load_org_unit(self, unit):
+        """(org_df, vacant_df) untuk satu Unit Kerja Struktur Organisasi."""
+        org = self.manifest["org"]
+        entry = org["units"].get(unit)
+        if entry is None:
+            raise KeyError(f"Unit Kerja tidak ditemukan di partisi: {unit}")
+        return pd.read_pickle(self.root / entry["file"]), pd.read_pickle(self.root / entry["vacant_file"])
+
+    # --- Pencarian ---
+    def load_search_index(self) -> rekap_search.EmployeeSearchIndex:
+        """Indeks pencarian yang dibangun saat partisi ditulis."""
+        with open(self.root / self.manifest["search_file"], "rb") as f:
+            return pickle.load(f)
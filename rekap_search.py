@@ -0,0 +1,296 @@
+# rekap_search.py
+# ==========================================
+# 🔎 Indeks Pencarian Karyawan (tanpa Streamlit)
+# Dibangun SEKALI per versi dataset, lalu dipakai untuk setiap query:
+# - Pers.No./PN  : exact & prefix
+# - Nama         : prefix nama lengkap, prefix per token, toleran typo (1 edit)
+# - Jabatan      : prefix per token, toleran typo (1 edit)
+# Setiap hasil ditautkan ke posisi di Struktur Organisasi (berdasarkan PN) bila ada.
+# ==========================================
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import islice
+
+import pandas as pd
+
+import rekap_engine as engine
+
+# Skor per jenis kecocokan (lebih tinggi = lebih relevan)
+SCORE_PN_EXACT = 100
+SCORE_NAME_EXACT = 90
+SCORE_PN_PREFIX = 80
+SCORE_NAME_PREFIX = 70
+SCORE_TOKEN_EXACT = 10
+SCORE_TOKEN_PREFIX = 8
+SCORE_TOKEN_FUZZY = 5
+SCORE_POSITION_TOKEN = 3
+SCORE_POSITION_FUZZY = 2
+
+MIN_PREFIX_LEN = 2
+MIN_FUZZY_LEN = 4
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_text(value) -> str:
+    """Lowercase, buang aksen & tanda baca → token dipisah spasi."""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    text = unicodedata.normalize("NFKD", str(value)).encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+def normalize_pn(value) -> str:
+    """PN sebagai string digit/alfanumerik (12345.0 → 12345)."""
+    s = engine.norm_str(value)
+    if s.lower() in engine.NEG_VALUES:
+        return ""
+    if s.endswith(".0") and s[:-2].isdigit():
+        s = s[:-2]
+    return s.replace(" ", "").upper()
+
+
+def _deletes(token: str) -> set:
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """Jarak edit ≤ 1 (substitusi, sisip, hapus, atau tukar dua huruf bersebelahan)."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    if la > lb:
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class _TokenIndex:
+    """Token → row id, dengan lookup prefix (bisect) dan fuzzy (symmetric delete)."""
+
+    def __init__(self, fuzzy: bool):
+        self.rows = defaultdict(list)
+        self.sorted_tokens = []
+        self.fuzzy = fuzzy
+        self.deletes = defaultdict(set)
+
+    def add(self, token: str, row_id: int):
+        self.rows[token].append(row_id)
+
+    def freeze(self):
+        self.sorted_tokens = sorted(self.rows)
+        if self.fuzzy:
+            for token in self.sorted_tokens:
+                if len(token) >= MIN_FUZZY_LEN - 1:
+                    for d in _deletes(token):
+                        self.deletes[d].add(token)
+
+    def prefix_tokens(self, prefix: str):
+        # Iterasi per index (bukan slice) agar tidak menyalin sisa list tiap query
+        tokens = self.sorted_tokens
+        for i in range(bisect_left(tokens, prefix), len(tokens)):
+            if not tokens[i].startswith(prefix):
+                break
+            yield tokens[i]
+
+    def fuzzy_tokens(self, query: str) -> set:
+        if not self.fuzzy or len(query) < MIN_FUZZY_LEN:
+            return set()
+        candidates = set(self.deletes.get(query, ()))
+        if query in self.rows:
+            candidates.add(query)
+        for d in _deletes(query):
+            if d in self.rows:
+                candidates.add(d)
+            candidates.update(self.deletes.get(d, ()))
+        return {c for c in candidates if _within_one_edit(query, c)}
+
+
+class EmployeeSearchIndex:
+    """Indeks pencarian karyawan untuk satu versi dataset."""
+
+    def __init__(self, df: pd.DataFrame, org_df: pd.DataFrame = None, version: str = ""):
+        self.version = version
+        pn_col = engine.pick_col(df.columns, ["Pers.No.", "PN", "Pers No", "PersNo", "NIK", "NIK SAP"])
+        name_col = engine.pick_col(df.columns, engine.NAME_CANDIDATES)
+        position_col = engine.pick_col(df.columns, engine.POSITION_CANDIDATES)
+        unit_col = engine.pick_col(df.columns, engine.UNIT_CANDIDATES)
+
+        def column(col):
+            return df[col].tolist() if col else [None] * len(df)
+
+        self.pn = [normalize_pn(v) for v in column(pn_col)]
+        self.names = [engine.norm_str(v) if v is not None and not pd.isna(v) else "" for v in column(name_col)]
+        self.positions = [engine.norm_str(v) if v is not None and not pd.isna(v) else "" for v in column(position_col)]
+        self.units = [engine.norm_str(v) if v is not None and not pd.isna(v) else "" for v in column(unit_col)]
+        self._name_norm = [normalize_text(n) for n in self.names]
+
+        # PN & nama lengkap: list terurut (nilai, row_id) untuk prefix via bisect
+        self._pn_sorted = sorted((pn, i) for i, pn in enumerate(self.pn) if pn)
+        self._name_sorted = sorted((n, i) for i, n in enumerate(self._name_norm) if n)
+        self._pn_exact = defaultdict(list)
+        for pn, i in self._pn_sorted:
+            self._pn_exact[pn].append(i)
+
+        self._name_tokens = _TokenIndex(fuzzy=True)
+        self._position_tokens = _TokenIndex(fuzzy=True)
+        for i, name in enumerate(self._name_norm):
+            for token in set(name.split()):
+                self._name_tokens.add(token, i)
+        for i, position in enumerate(self.positions):
+            for token in set(normalize_text(position).split()):
+                self._position_tokens.add(token, i)
+        self._name_tokens.freeze()
+        self._position_tokens.freeze()
+
+        self._org_positions = build_org_position_lookup(org_df) if org_df is not None else {}
+
+    def __len__(self):
+        return len(self.pn)
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+    @staticmethod
+    def _prefix_rows(sorted_pairs, prefix):
+        for i in range(bisect_left(sorted_pairs, (prefix,)), len(sorted_pairs)):
+            value, row_id = sorted_pairs[i]
+            if not value.startswith(prefix):
+                break
+            yield value, row_id
+
+    def _token_scores(self, token: str) -> dict:
+        """Skor terbaik per row untuk satu token query (nama + jabatan)."""
+        scores = {}
+
+        def bump(rows, score):
+            for r in rows:
+                if scores.get(r, 0) < score:
+                    scores[r] = score
+
+        bump(self._name_tokens.rows.get(token, ()), SCORE_TOKEN_EXACT)
+        if len(token) >= MIN_PREFIX_LEN:
+            for t in self._name_tokens.prefix_tokens(token):
+                bump(self._name_tokens.rows[t], SCORE_TOKEN_PREFIX)
+            for t in self._position_tokens.prefix_tokens(token):
+                bump(self._position_tokens.rows[t], SCORE_POSITION_TOKEN)
+        for t in self._name_tokens.fuzzy_tokens(token):
+            bump(self._name_tokens.rows[t], SCORE_TOKEN_FUZZY)
+        for t in self._position_tokens.fuzzy_tokens(token):
+            bump(self._position_tokens.rows[t], SCORE_POSITION_FUZZY)
+        return scores
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """Cari karyawan; hasil terurut skor (tertinggi dulu) lalu nama.
+
+        Scan prefix PN & nama lengkap berhenti setelah `limit` hit (satu tier = satu
+        skor; untuk PN prefix yang dipakai `limit` PN terkecil). Skor token dilewati
+        bila `limit` hasil sudah di atas skor token maksimal.
+        """
+        scores = {}
+        matches = {}
+
+        def add(row_id, score, match):
+            if scores.get(row_id, -1) < score:
+                scores[row_id] = score
+                matches[row_id] = match
+
+        pn_query = normalize_pn(query)
+        if pn_query:
+            for row_id in self._pn_exact.get(pn_query, ()):
+                add(row_id, SCORE_PN_EXACT, "PN")
+            if len(pn_query) >= MIN_PREFIX_LEN:
+                exact_hits = len(self._pn_exact.get(pn_query, ()))
+                for _, row_id in islice(self._prefix_rows(self._pn_sorted, pn_query), limit + exact_hits):
+                    add(row_id, SCORE_PN_PREFIX, "PN prefix")
+
+        text_query = normalize_text(query)
+        if text_query:
+            if len(text_query) >= MIN_PREFIX_LEN:
+                # List terurut nama: nama persis (skor tertinggi) selalu muncul paling awal
+                for name, row_id in islice(self._prefix_rows(self._name_sorted, text_query), limit):
+                    add(row_id, SCORE_NAME_EXACT if name == text_query else SCORE_NAME_PREFIX, "Nama")
+
+            tokens = text_query.split()
+            max_token_score = SCORE_TOKEN_EXACT * len(tokens)
+            if sum(1 for score in scores.values() if score > max_token_score) >= limit:
+                tokens = []  # hasil teratas sudah pasti; skor token tidak bisa mengubahnya
+
+            # Semua token query harus cocok (nama/jabatan); skor = jumlah skor token
+            token_rows = None
+            for token in tokens:
+                token_scores = self._token_scores(token)
+                if token_rows is None:
+                    token_rows = token_scores
+                else:
+                    token_rows = {r: s + token_scores[r] for r, s in token_rows.items() if r in token_scores}
+                if not token_rows:
+                    break
+            for row_id, score in (token_rows or {}).items():
+                add(row_id, score, "Token")
+
+        ranked = heapq.nsmallest(limit, scores, key=lambda r: (-scores[r], self.names[r]))
+        return [self._result(row_id, scores[row_id], matches[row_id]) for row_id in ranked]
+
+    def _result(self, row_id: int, score: int, match: str) -> dict:
+        return {
+            "pn": self.pn[row_id],
+            "nama": self.names[row_id],
+            "jabatan": self.positions[row_id],
+            "unit": self.units[row_id],
+            "score": score,
+            "match": match,
+            "org": self._org_positions.get(self.pn[row_id]),
+        }
+
+
+def build_org_position_lookup(org_df: pd.DataFrame) -> dict:
+    """PN → posisi di Struktur Organisasi (Unit Kerja, Bagian, Jabatan, Level)."""
+    pn_col = engine.pick_col(org_df.columns, engine.ORG_PN_CANDIDATES)
+    if not pn_col:
+        return {}
+    fields = {
+        "unit_kerja": engine.pick_col(org_df.columns, engine.ORG_UNIT_CANDIDATES),
+        "bagian": engine.pick_col(org_df.columns, engine.ORG_BAGIAN_CANDIDATES),
+        "jabatan": engine.pick_col(org_df.columns, engine.ORG_JABATAN_CANDIDATES),
+        "level": engine.pick_col(org_df.columns, ["LEVEL JABATAN", "LEVEL", "Level"]),
+    }
+    lookup = {}
+    for record in org_df.to_dict("records"):
+        pn = normalize_pn(record.get(pn_col))
+        if not pn or pn in lookup or not engine.has_valid_pn(pn):
+            continue
+        lookup[pn] = {
+            key: (engine.norm_str(record.get(col)) if col and not pd.isna(record.get(col)) else "")
+            for key, col in fields.items()
+        }
+    return lookup
+
+
+def results_to_frame(results: list) -> pd.DataFrame:
+    """Hasil search() sebagai tabel tampilan."""
+    rows = []
+    for r in results:
+        org = r["org"] or {}
+        rows.append({
+            "NIK SAP": r["pn"],
+            "Nama Karyawan": r["nama"],
+            "Jabatan": r["jabatan"],
+            "Unit Kerja": r["unit"],
+            "Posisi Struktur Organisasi": " / ".join(v for v in (org.get("unit_kerja"), org.get("bagian"), org.get("jabatan")) if v) or "-",
+            "Skor": r["score"],
+        })
+    return pd.DataFrame(rows, columns=["NIK SAP", "Nama Karyawan", "Jabatan", "Unit Kerja", "Posisi Struktur Organisasi", "Skor"])
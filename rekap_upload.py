@@ -0,0 +1,121 @@
+# rekap_upload.py
+# ==========================================
+# 🔐 Akses Upload & Status Publish (tanpa Streamlit)
+# Gerbang upload dashboard dipisah dari streamlit_app.py agar bisa diuji:
+# - Akses admin (secret upload_password) atau GitHub token user yang punya akses push
+# - Token publish sesuai jenis akses sesi
+# - Status publish GitHub per file, dibagi antar sesi
+# `session_state` cukup dict-like (st.session_state atau dict biasa).
+# ==========================================
+
+import hmac
+import threading
+
+import requests
+
+ACCESS_ADMIN = "admin"
+ACCESS_TOKEN = "token"
+
+# (connect, read) detik: publish berjalan di thread background, jangan sampai menggantung
+GITHUB_API_TIMEOUT = (10, 120)
+
+
+# -----------------------------
+# 🔐 Akses upload
+# -----------------------------
+def github_token_can_push(token: str, owner, repo, timeout=GITHUB_API_TIMEOUT):
+    """(boleh, pesan): token punya akses push ke repo data?"""
+    if not owner or not repo:
+        return False, "Secrets repo_owner/repo_name belum dikonfigurasi."
+    try:
+        r = requests.get(
+            f"https://api.github.com/repos/{owner}/{repo}",
+            headers={"Authorization": f"Bearer {token}", "Accept": "application/vnd.github+json"},
+            timeout=timeout,
+        )
+    except requests.RequestException as e:
+        return False, f"Gagal verifikasi token: {e}"
+    if r.status_code != 200 or not r.json().get("permissions", {}).get("push"):
+        return False, "Token tidak valid atau tidak punya akses push ke repo."
+    return True, "Token terverifikasi."
+
+
+def unlock_upload(session_state, credential: str, admin_password=None, verify_token=None):
+    """Buka akses upload untuk sesi ini. Password admin → publish pakai token server;
+    GitHub token user (diverifikasi `verify_token`) → publish HANYA pakai token tersebut."""
+    if not credential:
+        return False, "❌ Akses ditolak: kredensial kosong."
+    if admin_password and hmac.compare_digest(credential.encode(), str(admin_password).encode()):
+        session_state["upload_access"] = ACCESS_ADMIN
+        return True, "🔓 Akses upload admin aktif."
+    ok, msg = verify_token(credential) if verify_token else (False, "Verifikasi token tidak tersedia.")
+    if ok:
+        session_state["upload_access"] = ACCESS_TOKEN
+        session_state["github_token_temp"] = credential
+        return True, "🔓 Akses upload aktif (publish memakai token Anda)."
+    return False, f"❌ Akses ditolak: {msg}"
+
+
+def has_upload_access(session_state) -> bool:
+    return session_state.get("upload_access") in (ACCESS_ADMIN, ACCESS_TOKEN)
+
+
+def publish_token(session_state, server_token=None):
+    """Token untuk publish sesuai jenis akses sesi ini (None = publish dilewati)."""
+    access = session_state.get("upload_access")
+    if access == ACCESS_TOKEN:
+        return session_state.get("github_token_temp")
+    if access == ACCESS_ADMIN:
+        return server_token or None
+    return None
+
+
+# -----------------------------
+# 📤 Status publish
+# -----------------------------
+class PublishJobs:
+    """Status publish GitHub per file: {path: {hash, status, message}}.
+
+    Hasil publish hanya dicatat bila hash-nya masih milik upload terakhir untuk path
+    tersebut, jadi publish lama yang selesai belakangan tidak menimpa status upload baru.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs = {}
+
+    def start(self, path: str, content_hash: str):
+        with self._lock:
+            self._jobs[path] = {
+                "hash": content_hash,
+                "status": "running",
+                "message": "⏳ Publish ke GitHub berjalan di background...",
+            }
+
+    def finish(self, path: str, content_hash: str, ok: bool, message: str) -> bool:
+        """Catat hasil publish; False bila sudah ada upload lebih baru untuk path ini."""
+        with self._lock:
+            current = self._jobs.get(path)
+            if current is None or current["hash"] != content_hash:
+                return False
+            self._jobs[path] = {"hash": content_hash, "status": "done" if ok else "failed", "message": message}
+            return True
+
+    def items(self) -> list:
+        with self._lock:
+            return [(path, dict(job)) for path, job in self._jobs.items()]
+
+    def run_in_background(self, path: str, content_hash: str, publish) -> threading.Thread:
+        """Jalankan `publish()` → (ok, pesan) di thread terpisah; UI tidak menunggu."""
+        self.start(path, content_hash)
+
+        def run():
+            try:
+                ok, msg = publish()
+            except Exception as e:
+                ok, msg = False, f"❌ Gagal upload: {e}"
+            self.finish(path, content_hash, ok, msg)
+
+        thread = threading.Thread(target=run, name=f"publish-{path}", daemon=True)
+        thread.start()
+        return thread
@@ -17,12 +17,18 @@ import base64
 import subprocess
 import os
 from pathlib import Path
-import plotly.graph_objects as go
 from io import BytesIO
 from datetime import datetime
 from email.utils import parsedate_to_datetime
 import time
 
+import rekap_charts
+import rekap_engine as engine
+import rekap_loader
+import rekap_partition
+import rekap_search
+import rekap_upload
+
 # ==============================================================
 #                    CONFIGURATION & CONSTANTS
 # ==============================================================
@@ -65,16 +71,15 @@ if owner and repo:
 else:
     ORG_STRUCTURE_URL = None
 
+# Mode partisi (opsional): folder hasil `python rekap_cli.py --format partitions`.
+# Jika manifest ada, dashboard hanya memuat partisi unit yang dipilih.
+try:
+    PARTITION_DIR = st.secrets.get("partition_dir") or os.environ.get("REKAP_PARTITION_DIR")
+except Exception:
+    PARTITION_DIR = os.environ.get("REKAP_PARTITION_DIR")
+
 # 🧰 Utilitas Umum
 # -----------------------------
-def pick_col(cols, candidates):
-    """Ambil nama kolom yang cocok (case-insensitive) dari kandidat."""
-    lut = {c.upper(): c for c in cols}
-    for cand in candidates:
-        if cand.upper() in lut:
-            return lut[cand.upper()]
-    return None
-
 def get_last_update_time():
     """Ambil waktu last-modified dari file lokal atau GitHub untuk database utama."""
     local_path = Path(LOCAL_FILE)
@@ -101,29 +106,33 @@ def get_last_update_time():
 # -----------------------------
 # 📦 Loader Data (dengan cache)
 # -----------------------------
-@st.cache_data(ttl=3600)
+@st.cache_resource
+def remote_sources():
+    """Cache remote bersama semua sesi: single-flight + stale-while-revalidate (TTL 1 jam).
+
+    Saat TTL habis, sesi tetap mendapat versi lama sementara SATU refresh berjalan di
+    background; refresh yang gagal tidak menghapus dataset terakhir yang valid.
+    """
+    return {
+        "main": rekap_loader.SourceCache(
+            lambda key, previous: rekap_loader.load_excel_if_changed(key[0], previous, sheet_name=key[1]), ttl=3600
+        ),
+        "org": rekap_loader.SourceCache(rekap_loader.load_org_sheets_if_changed, ttl=3600),
+    }
+
 def load_excel_data(url_or_path, sheet_name=0):
     """Load Excel dari local path (jika ada) atau remote URL."""
-    # Cek apakah file ada secara lokal
-    local_path = Path(url_or_path) if not url_or_path.startswith("http") else None
-    if local_path and local_path.exists():
-        try:
-            df = pd.read_excel(local_path, sheet_name=sheet_name)
-            return df, None
-        except Exception as e:
-            return None, str(e)
-    
-    # Jika tidak ada lokal atau parameter adalah URL, coba dari remote
-    if url_or_path.startswith("http"):
-        try:
-            r = requests.get(url_or_path, timeout=60)
-            r.raise_for_status()
-            df = pd.read_excel(BytesIO(r.content), sheet_name=sheet_name)
-            return df, None
-        except Exception as e:
-            return None, str(e)
-    
-    return None, "File tidak ditemukan (lokal maupun remote)"
+    return remote_sources()["main"].get((url_or_path, sheet_name))
+
+@st.cache_data(max_entries=4)
+def load_local_excel(content_hash, _path, sheet_name=0, _parsed=None):
+    """Parse workbook lokal; cache di-key hash isi (bukan path/TTL), parse sekali per versi.
+
+    `_parsed` (tidak ikut key) dipakai untuk seed cache dengan hasil parse upload.
+    """
+    if _parsed is not None:
+        return _parsed, None
+    return rekap_loader.load_excel_data(_path, sheet_name=sheet_name)
 
 @st.cache_data(ttl=3600)
 def load_all_sheets(url):
@@ -138,70 +147,137 @@ def load_all_sheets(url):
     except Exception as e:
         return None, str(e)
 
-@st.cache_data(ttl=3600)
 def load_org_sheets(url_or_path):
     """Load Excel sheets dari local path (jika ada) atau remote URL.
 
     Mencari baris header jika header tidak berada di baris pertama.
     """
-    def parse_sheets_from_xls(xls):
-        sheets = {}
-        header_keywords = ['PN', 'NAMA', 'NO', 'JABATAN', 'UNIT', 'LEVEL']
-        import re
-        pattern = re.compile('|'.join([kw for kw in header_keywords]), re.IGNORECASE)
-        for sheet in xls.sheet_names:
-            try:
-                # baca 20 baris awal tanpa header untuk mendeteksi header
-                df_preview = xls.parse(sheet_name=sheet, header=None, nrows=20)
-                header_row = None
-                for i, row in df_preview.iterrows():
-                    row_str = row.astype(str).str.strip().fillna('').str.upper()
-                    if any(cell in row_str.values for cell in ["PN","NAMA","NO","JABATAN","UNIT","LEVEL"]):
-                        header_row = i
-                        break
-                # Parse dengan header terdeteksi jika ada
-                if header_row is not None:
-                    df = xls.parse(sheet_name=sheet, header=header_row)
-                else:
-                    df = xls.parse(sheet_name=sheet, header=0)
-                # Drop kolom kosong penuh
-                df = df.loc[:, ~df.columns.astype(str).str.contains('^Unnamed') | df.notna().any()]
-                sheets[sheet] = df
-            except Exception:
-                try:
-                    sheets[sheet] = xls.parse(sheet_name=sheet)
-                except Exception:
-                    sheets[sheet] = pd.DataFrame()
-        return sheets
-
-    # Cek lokal
-    local_path = Path(url_or_path) if not url_or_path.startswith("http") else None
-    if local_path and local_path.exists():
-        try:
-            bio = BytesIO(local_path.read_bytes())
-            xls = pd.ExcelFile(bio)
-            sheets = parse_sheets_from_xls(xls)
-            return sheets, None
-        except Exception as e:
-            return None, str(e)
-
-    # Cek remote
-    if url_or_path and url_or_path.startswith("http"):
-        try:
-            r = requests.get(url_or_path, timeout=60)
-            r.raise_for_status()
-            bio = BytesIO(r.content)
-            xls = pd.ExcelFile(bio)
-            sheets = parse_sheets_from_xls(xls)
-            return sheets, None
-        except Exception as e:
-            return None, str(e)
+    return remote_sources()["org"].get(url_or_path)
+
+@st.cache_data(max_entries=4)
+def load_local_org_sheets(content_hash, _path, _parsed=None):
+    """Parse Struktur Organisasi lokal; cache di-key hash isi file."""
+    if _parsed is not None:
+        return _parsed, None
+    return rekap_loader.load_org_sheets(_path)
+
+def load_main_data():
+    """Database utama: file lokal (key = hash isi) atau remote URL (cache bersama, TTL)."""
+    identity = rekap_loader.file_identity(LOCAL_FILE)
+    if identity:
+        return load_local_excel(identity.sha256, identity.path)
+    return load_excel_data(DEFAULT_URL)
+
+def load_org_data():
+    """Struktur Organisasi: file lokal (key = hash isi) atau remote URL (cache bersama, TTL)."""
+    identity = rekap_loader.file_identity(ORG_STRUCTURE_FILE)
+    if identity:
+        return load_local_org_sheets(identity.sha256, identity.path)
+    return load_org_sheets(ORG_STRUCTURE_URL)
+
+@st.cache_resource(max_entries=2)
+def open_partitions(manifest_hash, _root):
+    """Manifest partisi dibaca sekali per versi manifest."""
+    return rekap_partition.PartitionedDataset(_root)
+
+def partition_error_message(e):
+    """Pesan error partisi untuk user, selalu dengan petunjuk build ulang."""
+    message = str(e)
+    if rekap_partition.REBUILD_HINT not in message:
+        message = f"{message}. {rekap_partition.REBUILD_HINT}"
+    return f"❌ Gagal memuat data terpartisi ({PARTITION_DIR}): {message}"
+
+def load_partitions():
+    """Dataset terpartisi aktif, atau None bila mode partisi tidak dipakai."""
+    if not rekap_partition.PartitionedDataset.exists(PARTITION_DIR):
+        return None
+    identity = rekap_loader.file_identity(Path(PARTITION_DIR) / rekap_partition.MANIFEST_FILE)
+    if not identity:
+        return None
+    try:
+        return open_partitions(identity.sha256, PARTITION_DIR)
+    except (OSError, ValueError) as e:
+        # Manifest format lama / rusak
+        st.error(partition_error_message(e))
+        st.stop()
+
+@st.cache_data(max_entries=16)
+def read_unit_partition(version, unit, _partitions):
+    return _partitions.load_unit(unit)
+
+@st.cache_data(max_entries=16)
+def read_org_partition(version, unit, _partitions):
+    return _partitions.load_org_unit(unit)
+
+def load_unit_partition(partitions, unit):
+    """Baris karyawan SATU unit dari partisi (cache per versi); file hilang → error, bukan traceback."""
+    try:
+        return read_unit_partition(partitions.version, unit, partitions)
+    except Exception as e:
+        st.error(partition_error_message(e))
+        st.stop()
+
+def load_org_partition(partitions, unit):
+    """(org_df, vacant_df) SATU Unit Kerja dari partisi (cache per versi)."""
+    try:
+        return read_org_partition(partitions.version, unit, partitions)
+    except Exception as e:
+        st.error(partition_error_message(e))
+        st.stop()
+
+def rerun_active_sessions():
+    """Minta semua sesi yang terhubung untuk rerun (best-effort, API internal Streamlit)."""
+    try:
+        from streamlit.runtime import Runtime
+        for session_info in Runtime.instance()._session_mgr.list_active_sessions():
+            session = session_info.session
+            session.request_rerun(getattr(session, "_client_state", None))
+    except Exception:
+        pass
+
+def rebuild_partitions():
+    """Mode partisi: tulis ulang partisi dari workbook lokal terkini. Mengembalikan error atau None.
+
+    Aman dipanggil bersamaan (upload + watcher): build_partitions memegang lock proses
+    dan melewati build bila manifest sudah menunjuk ke versi yang sama.
+    """
+    main_df, error = load_main_data()
+    if error:
+        return error
+    org_sheets_now, _ = load_org_data()
+    try:
+        rekap_partition.build_partitions(main_df, org_sheets_now, PARTITION_DIR)
+    except Exception as e:
+        return str(e)
+    return None
+
+@st.cache_resource
+def start_workbook_watcher():
+    """Satu watcher per proses: reload HANYA workbook yang berubah di background, lalu rerun sesi.
 
-    return None, "File tidak ditemukan (lokal maupun remote)"
+    Mode partisi: workbook yang berubah langsung dipartisi ulang (manifest baru → sesi
+    memuat versi baru), karena frame utuh tidak dipakai dashboard.
+    """
+    main_path = os.path.abspath(LOCAL_FILE)
+
+    def on_change(path, identity):
+        if rekap_partition.PartitionedDataset.exists(PARTITION_DIR):
+            error = rebuild_partitions()
+            if error:
+                raise RuntimeError(f"Gagal memperbarui partisi: {error}")
+        elif path == main_path:
+            load_local_excel(identity.sha256, identity.path)
+        else:
+            load_local_org_sheets(identity.sha256, identity.path)
+        rerun_active_sessions()
+
+    return rekap_loader.WorkbookWatcher([LOCAL_FILE, ORG_STRUCTURE_FILE], on_change).start()
 
 # -----------------------------
 # 🔒 Upload ke GitHub via Contents API (tanpa git)
 # -----------------------------
+GITHUB_API_TIMEOUT = rekap_upload.GITHUB_API_TIMEOUT
+
 def has_github_secrets():
     required = ["github_token", "repo_owner", "repo_name"]
     try:
@@ -209,7 +285,7 @@ def has_github_secrets():
     except Exception:
         return False
 
-def upload_to_github_via_api(content_bytes: bytes, path_in_repo: str, commit_message: str):
+def upload_to_github_via_api(content_bytes: bytes, path_in_repo: str, commit_message: str, token: str = None):
     """
     Create / Update file di GitHub menggunakan Contents API.
     Memerlukan secrets:
@@ -218,10 +294,11 @@ def upload_to_github_via_api(content_bytes: bytes, path_in_repo: str, commit_mes
       - repo_name
       - branch (opsional, default "main")
     
-    Prioritas token: session_state.github_token_temp > st.secrets
+    Prioritas token: argumen token > session_state.github_token_temp > st.secrets
+    (isi `token` bila dipanggil dari thread background, karena session_state tidak tersedia di sana)
     """
     try:
-        token = st.session_state.get('github_token_temp') or st.secrets.get("github_token")
+        token = token or st.session_state.get('github_token_temp') or st.secrets.get("github_token")
         owner = st.secrets.get("repo_owner")
         repo = st.secrets.get("repo_name")
         branch = st.secrets.get("branch", "main")
@@ -236,7 +313,7 @@ def upload_to_github_via_api(content_bytes: bytes, path_in_repo: str, commit_mes
 
     # Cek SHA jika file sudah ada
     params = {"ref": branch}
-    r_get = requests.get(base_url, headers=headers, params=params)
+    r_get = requests.get(base_url, headers=headers, params=params, timeout=GITHUB_API_TIMEOUT)
     sha = r_get.json().get("sha") if r_get.status_code == 200 else None
 
     payload = {
@@ -247,7 +324,7 @@ def upload_to_github_via_api(content_bytes: bytes, path_in_repo: str, commit_mes
     if sha:
         payload["sha"] = sha
 
-    r_put = requests.put(base_url, headers=headers, json=payload)
+    r_put = requests.put(base_url, headers=headers, json=payload, timeout=GITHUB_API_TIMEOUT)
     if r_put.status_code in (200, 201):
         return True, "✅ Berhasil upload ke GitHub via API"
     else:
@@ -342,117 +419,241 @@ def try_git_push(file_path: str, commit_message: str = "Update via Streamlit"):
         return False, f"❌ Error git push: {str(e)}"
 
 
+# -----------------------------
+# 📤 Upload → Cache (tanpa download ulang)
+# -----------------------------
+UPLOAD_TARGETS = {"Database Utama": LOCAL_FILE, "Struktur Organisasi": ORG_STRUCTURE_FILE}
+
+@st.cache_resource
+def publish_jobs():
+    """Status publish GitHub per file (dibagi antar sesi)."""
+    return rekap_upload.PublishJobs()
+
+def publish_in_background(content_bytes: bytes, path_in_repo: str, content_hash: str, token: str):
+    """Push ke GitHub via Contents API di thread terpisah; UI tidak menunggu."""
+    publish_jobs().run_in_background(
+        path_in_repo,
+        content_hash,
+        lambda: upload_to_github_via_api(content_bytes, path_in_repo, f"Update {path_in_repo} via Streamlit", token=token),
+    )
+
+def apply_uploaded_workbook(target: str, content_bytes: bytes):
+    """Parse & validasi SEKALI, seed cache loader dengan hash baru, lalu publish di background."""
+    if not rekap_upload.has_upload_access(st.session_state):
+        return False, "❌ Akses upload belum dibuka."
+    path = UPLOAD_TARGETS[target]
+    try:
+        if path == LOCAL_FILE:
+            parsed = rekap_loader.parse_excel_bytes(content_bytes)
+            unit_col_new, eg_col_new = engine.detect_core_columns(parsed)
+            if not unit_col_new or not eg_col_new:
+                return False, "❌ Kolom wajib tidak ditemukan: Unit / Employee Group. Mohon cek struktur file Excel."
+        else:
+            parsed = rekap_loader.parse_org_bytes(content_bytes)
+            if engine.split_org_sheets(parsed)[0] is None:
+                return False, "❌ Sheet 'Struktur Organisasi' atau 'Database Vacant' tidak ditemukan."
+    except Exception as e:
+        return False, f"❌ File tidak bisa dibaca: {e}"
+
+    # Simpan lokal (hash dicatat langsung) → load berikutnya baca dari cache, bukan GitHub
+    try:
+        identity = rekap_loader.write_workbook(path, content_bytes)
+    except OSError as e:
+        return False, f"❌ Gagal menyimpan file: {e}"
+    if path == LOCAL_FILE:
+        load_local_excel(identity.sha256, identity.path, _parsed=parsed)
+    else:
+        load_local_org_sheets(identity.sha256, identity.path, _parsed=parsed)
+
+    # Mode partisi: tulis ulang partisi (loader sudah di-seed, jadi tanpa parse ulang)
+    if rekap_partition.PartitionedDataset.exists(PARTITION_DIR):
+        error = rebuild_partitions()
+        if error:
+            return False, f"❌ Data tersimpan, tapi gagal memperbarui partisi: {error}"
+
+    token = publish_token()
+    if not token:
+        return True, "✅ Data baru diterapkan (lokal). Publish GitHub dilewati: secrets belum dikonfigurasi."
+    publish_in_background(content_bytes, path, identity.sha256, token)
+    return True, "✅ Data baru diterapkan. Publish ke GitHub berjalan di background."
+
+# -----------------------------
+# 🔐 Akses upload: admin (secret upload_password) atau GitHub token milik user
+# -----------------------------
+def github_token_can_push(token: str):
+    """(boleh, pesan): token punya akses push ke repo data?"""
+    try:
+        owner = st.secrets.get("repo_owner")
+        repo = st.secrets.get("repo_name")
+    except Exception:
+        owner = repo = None
+    return rekap_upload.github_token_can_push(token, owner, repo)
+
+def unlock_upload(credential: str):
+    """Buka akses upload untuk sesi ini (password admin atau GitHub token user)."""
+    try:
+        admin_password = st.secrets.get("upload_password")
+    except Exception:
+        admin_password = None
+    return rekap_upload.unlock_upload(st.session_state, credential, admin_password, github_token_can_push)
+
+def publish_token():
+    """Token untuk publish sesuai jenis akses sesi ini (None = publish dilewati)."""
+    server_token = st.secrets.get("github_token") if has_github_secrets() else None
+    return rekap_upload.publish_token(st.session_state, server_token)
+
+with st.sidebar:
+    st.subheader("📤 Upload File (.xlsx)")
+    if not rekap_upload.has_upload_access(st.session_state):
+        credential = st.text_input("Password admin / GitHub token", type="password", key="upload_credential")
+        if credential and st.button("🔓 Buka akses upload", key="upload_unlock"):
+            ok, msg = unlock_upload(credential)
+            (st.success if ok else st.error)(msg)
+            if ok:
+                st.rerun()
+    else:
+        upload_target = st.radio("Jenis file:", list(UPLOAD_TARGETS), key="upload_target")
+        uploaded_file = st.file_uploader("Pilih file .xlsx", type=["xlsx"], key="upload_file")
+        if uploaded_file is not None and st.button("🚀 Terapkan & Publish", key="upload_apply"):
+            ok, msg = apply_uploaded_workbook(upload_target, uploaded_file.getvalue())
+            (st.success if ok else st.error)(msg)
+        # Status publish (path repo, hash, pesan error GitHub) hanya untuk sesi yang punya akses
+        for job_path, job in publish_jobs().items():
+            st.caption(f"{job_path} ({job['hash'][:8]}): {job['message']}")
+
+
 # 1) LOAD DATA UTAMA
-df, error = load_excel_data(LOCAL_FILE if Path(LOCAL_FILE).exists() else DEFAULT_URL)
-if error:
-    st.error(f"❌ Gagal memuat data utama: {error}")
-    st.stop()
-assert df is not None, "Data utama tidak berhasil dimuat"
+start_workbook_watcher()
+partitions = load_partitions()
+if partitions is None:
+    df, error = load_main_data()
+    if error:
+        st.error(f"❌ Gagal memuat data utama: {error}")
+        st.stop()
+    assert df is not None, "Data utama tidak berhasil dimuat"
+    if not Path(LOCAL_FILE).exists():
+        refresh_error = remote_sources()["main"].last_error((DEFAULT_URL, 0))
+        if refresh_error:
+            st.warning(f"⚠️ Refresh data utama gagal, menampilkan versi terakhir yang berhasil dimuat: {refresh_error}")
+
+    # Validasi minimal kolom inti
+    unit_col, eg_col = engine.detect_core_columns(df)
+    if not unit_col or not eg_col:
+        st.error("Kolom wajib tidak ditemukan: Unit / Employee Group. Mohon cek struktur file Excel.")
+        st.stop()
+else:
+    # Mode partisi: cukup manifest; data unit dimuat saat unit dipilih
+    df = None
+    unit_col, eg_col = partitions.unit_col, partitions.eg_col
+
+# 1b) LOAD STRUKTUR ORGANISASI (dipakai oleh pencarian & section Struktur Organisasi)
+use_org_partitions = partitions is not None and partitions.has_org
+if use_org_partitions:
+    org_sheets, org_error = None, None
+else:
+    org_sheets, org_error = load_org_data()
+    if org_sheets and ORG_STRUCTURE_URL and not Path(ORG_STRUCTURE_FILE).exists():
+        org_refresh_error = remote_sources()["org"].last_error(ORG_STRUCTURE_URL)
+        if org_refresh_error:
+            st.warning(f"⚠️ Refresh Struktur Organisasi gagal, menampilkan versi terakhir yang berhasil dimuat: {org_refresh_error}")
+
+# 1c) PENCARIAN KARYAWAN (indeks dibangun sekali per versi dataset)
+@st.cache_resource(max_entries=2)
+def get_search_index(data_version, org_version, _build):
+    """Indeks nama/PN/jabatan; key = versi isi workbook, bukan objek DataFrame."""
+    return _build()
+
+def build_search_index():
+    """Mode biasa: bangun dari frame utuh. Mode partisi: indeks yang ditulis bersama partisi."""
+    if partitions is not None:
+        return partitions.load_search_index()
+    org_df_index = engine.split_org_sheets(org_sheets)[0] if org_sheets else None
+    return rekap_search.EmployeeSearchIndex(df, org_df_index, version=rekap_loader.data_version(df))
+
+def load_search_index():
+    """(indeks, error). Mode partisi: search.pkl hilang/rusak → pesan error, bukan traceback."""
+    try:
+        index = get_search_index(
+            rekap_loader.data_version(df) if partitions is None else partitions.version,
+            rekap_loader.data_version(org_sheets) if org_sheets else "",
+            build_search_index,
+        )
+    except Exception as e:
+        if partitions is None:
+            raise
+        return None, partition_error_message(e)
+    return index, None
 
-# Validasi minimal kolom inti
-unit_col = pick_col(df.columns, ["Personel Subarea", "Personnel Subarea", "Personel Area", "Unit Kerja"])
-eg_col = pick_col(df.columns, ["Employee Group", "Kategori", "EmployeeGroup"])
-if not unit_col or not eg_col:
-    st.error("Kolom wajib tidak ditemukan: Unit / Employee Group. Mohon cek struktur file Excel.")
-    st.stop()
+st.divider()
+st.subheader("🔎 Cari Karyawan")
+search_query = st.text_input(
+    "Cari Nama / NIK SAP (PN) / Jabatan:",
+    key="search_query",
+    placeholder="Contoh: 2000052, hamdi, manajer pengolahan",
+    help="PN: exact & prefix. Nama: prefix, per kata, dan toleran salah ketik 1 huruf.",
+)
+if search_query.strip():
+    search_index, search_error = load_search_index()
+    search_results = search_index.search(search_query, limit=50) if search_index is not None else []
+    if search_error:
+        st.error(search_error)
+    elif search_results:
+        st.dataframe(rekap_search.results_to_frame(search_results), use_container_width=True, hide_index=True)
+        st.caption(f"Menampilkan {len(search_results)} hasil teratas dari {len(search_index)} karyawan.")
+    else:
+        st.info("Tidak ada karyawan yang cocok.")
 
 # 2) PILIHAN UNIT
 st.divider()
 st.subheader("🏢 Pilih Unit Kerja")
 
-units = sorted(df[unit_col].dropna().astype(str).unique().tolist())
-units_with_all = ["Semua Unit"] + units
+units = engine.list_units(df, unit_col) if partitions is None else partitions.units
+units_with_all = [engine.ALL_UNITS] + units
+
+def unit_label(unit):
+    """Mode partisi: tampilkan jumlah karyawan dari manifest di dropdown."""
+    if partitions is None or unit == engine.ALL_UNITS:
+        return unit
+    return f"{unit} ({partitions.unit_rows(unit):,} karyawan)"
+
 selected_unit = st.selectbox(
     "Pilih Unit Kerja:",
     options=units_with_all,
     index=0,
+    format_func=unit_label,
     help="Pilih unit kerja untuk melihat rekapitulasi spesifik",
+    key="selected_unit",
 )
 
-# Filter data
-if selected_unit == "Semua Unit":
-    df_filtered = df.copy()
-    display_unit = "Semua Unit Kerja"
+# Filter data (mode partisi: load partisi unit saja; Semua Unit dari total manifest)
+if partitions is None:
+    df_filtered, display_unit = engine.filter_unit(df, unit_col, selected_unit)
+elif selected_unit == engine.ALL_UNITS:
+    df_filtered, display_unit = None, "Semua Unit Kerja"
 else:
-    df_filtered = df[df[unit_col].astype(str) == selected_unit].copy()
-    display_unit = selected_unit
+    df_filtered, display_unit = load_unit_partition(partitions, selected_unit), selected_unit
 
 st.divider()
 
-# 3) REKAP KATEGORI + JENIS KARYAWAN TIDAK TETAP
-jenis_kt_col = pick_col(df_filtered.columns, ["JENIS KARYAWAN TIDAK TETAP", "Jenis Karyawan Tidak Tetap"])
-
-# Ambil Employee Group untuk semua karyawan
-count_by_group = df_filtered[eg_col].value_counts(dropna=False).reset_index()
-count_by_group.columns = ["Employee Group", "Jumlah"]
-count_by_group = count_by_group.sort_values("Jumlah", ascending=False)
-
-# Hitung Job Grade 11 (non-NaN dianggap approved)
-jg11_col = pick_col(df_filtered.columns, ["JOB GRADE 11", "JOB GRADE", "JG 11"])
-if jg11_col:
-    approved_series = df_filtered[df_filtered[jg11_col].notna()][eg_col].value_counts()
-    count_by_group["Approved_JG11"] = count_by_group["Employee Group"].map(approved_series).fillna(0).astype(int)
-else:
-    count_by_group["Approved_JG11"] = 0
-
-# Build summary yang menggabungkan kategori tetap + breakdown karpim & karpel tidak tetap
-summary_data = []
-
-# Karpel - Tetap
-karpel_tetap_count = len(df_filtered[df_filtered[eg_col] == "Karpel - Tetap"])
-if karpel_tetap_count > 0:
-    summary_data.append({"Kategori": "Karpel - Tetap", "Jumlah": karpel_tetap_count})
-
-# Karpim - Tetap
-karpim_tetap_count = len(df_filtered[df_filtered[eg_col] == "Karpim - Tetap"])
-if karpim_tetap_count > 0:
-    summary_data.append({"Kategori": "Karpim - Tetap", "Jumlah": karpim_tetap_count})
-
-# Karpel - Tidak Tetap (breakdown jenis)
-if jenis_kt_col:
-    karpel_tt_mask = df_filtered[eg_col] == "Karpel - Tidak Tetap"
-    if karpel_tt_mask.sum() > 0:
-        karpel_tt_df = df_filtered[karpel_tt_mask]
-        jenis_kt_series_karpel = karpel_tt_df[jenis_kt_col].dropna().astype(str).str.strip()
-        jenis_kt_series_karpel = jenis_kt_series_karpel[jenis_kt_series_karpel != ""]
-        jenis_counts_karpel = jenis_kt_series_karpel.value_counts()
-        for jenis, count in jenis_counts_karpel.items():
-            summary_data.append({"Kategori": f"Karpel - TT: {jenis}", "Jumlah": int(count)})
-
-# Karpim - Tidak Tetap (breakdown jenis)
-if jenis_kt_col:
-    karpim_tt_mask = df_filtered[eg_col] == "Karpim - Tidak Tetap"
-    if karpim_tt_mask.sum() > 0:
-        karpim_tt_df = df_filtered[karpim_tt_mask]
-        jenis_kt_series_karpim = karpim_tt_df[jenis_kt_col].dropna().astype(str).str.strip()
-        jenis_kt_series_karpim = jenis_kt_series_karpim[jenis_kt_series_karpim != ""]
-        jenis_counts_karpim = jenis_kt_series_karpim.value_counts()
-        for jenis, count in jenis_counts_karpim.items():
-            summary_data.append({"Kategori": f"Karpim - TT: {jenis}", "Jumlah": int(count)})
-
-# Buat summary_df & total
-if summary_data:
-    summary_df = pd.DataFrame(summary_data)
-    total_kategori = int(summary_df["Jumlah"].sum())
-    total_tetap = karpel_tetap_count + karpim_tetap_count
-    total_tidak_tetap = total_kategori - total_tetap
+# 3) REKAP KATEGORI + JENIS KARYAWAN TIDAK TETAP + DEMOGRAFI
+if df_filtered is not None:
+    report = engine.summarize_filtered(df_filtered, eg_col, selected_unit, display_unit)
 else:
-    summary_df = pd.DataFrame(columns=["Kategori", "Jumlah"])
-    total_kategori = 0
-    total_tetap = 0
-    total_tidak_tetap = 0
+    report = partitions.totals()
+dataset_version = partitions.version if partitions is not None else rekap_loader.data_version(df)
+summary_df = report["summary"]
+count_by_group = report["count_by_group"]
 
 # 4) METRICS ATAS
 col1, col2, col3, col4, col5 = st.columns(5)
 with col1:
-    st.metric("📊 Total Karyawan", int(len(df_filtered)))
+    st.metric("📊 Total Karyawan", report["total_karyawan"])
 with col2:
-    st.metric("✅ Karyawan Tetap", total_tetap)
+    st.metric("✅ Karyawan Tetap", report["total_tetap"])
 with col3:
-    st.metric("📂 Karyawan Tidak Tetap", total_tidak_tetap)
+    st.metric("📂 Karyawan Tidak Tetap", report["total_tidak_tetap"])
 with col4:
-    num_jenis = len(summary_df) if not summary_df.empty else 0
-    st.metric("🔹 Jumlah Kategori", num_jenis)
+    st.metric("🔹 Jumlah Kategori", report["num_kategori"])
 with col5:
     st.metric("📈 Unit", display_unit)
 
@@ -463,69 +664,16 @@ st.divider()
 # 5) DEMOGRAFI: GENDER & DISABILITAS
 st.subheader("👥 Demografi Karyawan")
 
-# --- Gender ---
-gender_col = pick_col(df_filtered.columns, ["Gender Key", "Gender", "Jenis Kelamin"])
-
-male_count = female_count = other_gender = 0
-
-if gender_col:
-    gender_series = (
-        df_filtered[gender_col]
-        .fillna("unknown")
-        .astype(str)
-        .str.strip()
-        .str.lower()
-    )
-
-    # Normalisasi variasi input
-    is_male = gender_series.isin(["male", "m", "l"])
-    is_female = gender_series.isin(["female", "f", "p"])
-
-    male_count = int(is_male.sum())
-    female_count = int(is_female.sum())
-    other_gender = int(len(gender_series) - male_count - female_count)
-
-# --- Disabilitas ---
-# Catatan: kita hitung per orang (row) apakah PUNYA disabilitas di salah satu kolom.
-disability_count = 0
-disability_cols = [c for c in df_filtered.columns if ("disabilitas" in c.lower() or "disability" in c.lower())]
-
-if disability_cols:
-    # Gabungkan kondisi "memiliki disabilitas" lintas kolom:
-    # - nilai tak kosong
-    # - bukan "nan"
-    # - bukan "tidak ada" / "tidak" / "none" / "no"
-    norm = (
-        df_filtered[disability_cols]
-        .astype(str)
-        .apply(lambda s: s.str.strip().str.lower())
-    )
-
-    negative_values = {"", "nan", "tidak ada", "tidak", "none", "no", "0"}
-    has_disability_any = ~norm.isin(negative_values)
-
-    # Agar tidak double count per orang:
-    disability_count = int(has_disability_any.any(axis=1).sum())
-
-# --- UI Streamlit ---
 gcol1, gcol2, gcol3 = st.columns(3)
 with gcol1:
-    st.metric("👨 Laki-laki", male_count)
+    st.metric("👨 Laki-laki", report["gender"]["male"])
 with gcol2:
-    st.metric("👩 Perempuan", female_count)
+    st.metric("👩 Perempuan", report["gender"]["female"])
 with gcol3:
-    st.metric("♿ Disabilitas", disability_count)
+    st.metric("♿ Disabilitas", report["disability"])
 # 6) DEMOGRAFI: USIA
-age_col = pick_col(df_filtered.columns, ["Age of employee", "Age", "Usia"])
-if age_col:
-    ages = pd.to_numeric(df_filtered[age_col], errors="coerce")
-    bins = [0, 24, 30, 40, 50, 55, 200]
-    labels = ["<24 Tahun", "25 - 30 Tahun", "31 - 40 Tahun", "41 - 50 Tahun", "51 - 55 Tahun", ">55 Tahun"]
-    age_groups = pd.cut(ages, bins=bins, labels=labels, include_lowest=True, right=True)
-    age_counts = age_groups.value_counts().reindex(labels).fillna(0).astype(int)
-else:
-    labels = ["<24 Tahun", "25 - 30 Tahun", "31 - 40 Tahun", "41 - 50 Tahun", "51 - 55 Tahun", ">55 Tahun"]
-    age_counts = pd.Series([0] * 6, index=labels)
+labels = engine.AGE_LABELS
+age_counts = report["age_counts"]
 
 st.subheader("👥 Demografi Berdasarkan Usia")
 st.markdown("""
@@ -540,34 +688,18 @@ for col, label in zip(acols, labels):
     with col:
         st.metric(label, int(age_counts[label]))
 
-# Line + Bar chart usia
-fig_age = go.Figure()
-fig_age.add_trace(go.Bar(
-    x=labels,
-    y=age_counts.values,
-    name='Jumlah Karyawan',
-    marker_color='#3366CC',
-    text=age_counts.values,
-    textposition='auto',
-))
-fig_age.add_trace(go.Scatter(
-    x=labels,
-    y=age_counts.values,
-    name='Tren',
-    mode='lines+markers',
-    line=dict(color='#FF4B4B', width=3),
-    marker=dict(size=10)
-))
-fig_age.update_layout(
-    title="Tren Distribusi Usia Karyawan",
-    xaxis_title="Kelompok Usia",
-    yaxis_title="Jumlah",
-    height=450,
-    font=dict(size=12),
-    margin=dict(l=20, r=20, t=80, b=20),
-    legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-)
-st.plotly_chart(fig_age, use_container_width=True)
+# Spec chart ringkas di-cache per (versi dataset, unit, urutan kustom): rerun
+# tanpa perubahan data tidak membangun/menserialisasi ulang figure.
+@st.cache_data(max_entries=256)
+def chart_payload(chart, version, unit, custom_order, _build):
+    return rekap_charts.figure_payload(chart, _build)
+
+def render_chart(chart, custom_order, build):
+    rekap_charts.record_render(chart)
+    st.plotly_chart(chart_payload(chart, dataset_version, selected_unit, custom_order, build), use_container_width=True)
+
+# Line + Bar chart usia (tidak bergantung urutan kustom)
+render_chart("usia", None, lambda: rekap_charts.age_figure(labels, age_counts))
 
 st.divider()
 
@@ -578,29 +710,12 @@ st.subheader("📋 Rekapitulasi Kategori Karyawan (Tetap & Breakdown Tidak Tetap
 use_custom_order = st.checkbox(
     "Prioritaskan Karyawan Tetap (Karpim → Karpel di urutan atas)",
     value=True,
+    key="use_custom_order",
     help="Jika aktif, 'Karpim - Tetap' ditampilkan paling atas, lalu 'Karpel - Tetap', diikuti kategori lain (diurutkan berdasarkan jumlah)."
 )
 
-def order_summary(df_src: pd.DataFrame, enable_custom: bool) -> pd.DataFrame:
-    if df_src.empty:
-        return df_src
-    if enable_custom:
-        def get_priority(kat: str) -> int:
-            kat_norm = str(kat).strip().lower()
-            if kat_norm == "karpim - tetap":
-                return 0
-            if kat_norm == "karpel - tetap":
-                return 1
-            return 2  # lainnya di bawah
-        df_out = df_src.copy()
-        df_out["__priority__"] = df_out["Kategori"].apply(get_priority)
-        df_out = df_out.sort_values(by=["__priority__", "Jumlah"], ascending=[True, False]).reset_index(drop=True)
-        return df_out
-    else:
-        return df_src.sort_values(by="Jumlah", ascending=False).reset_index(drop=True)
-
 if len(summary_df) > 0:
-    ordered_summary_df = order_summary(summary_df, use_custom_order)
+    ordered_summary_df = engine.order_summary(summary_df, use_custom_order)
     display_df = ordered_summary_df.rename(columns={"Kategori": "KATEGORI KARYAWAN", "Jumlah": "JUMLAH"})
 
     st.dataframe(
@@ -614,26 +729,7 @@ if len(summary_df) > 0:
     )
 
     st.subheader("📈 Visualisasi Distribusi Kategori")
-    fig = go.Figure(
-        data=[
-            go.Bar(
-                x=ordered_summary_df["Kategori"],
-                y=ordered_summary_df["Jumlah"],
-                marker=dict(color=ordered_summary_df["Jumlah"], colorscale="Viridis", showscale=True),
-                text=ordered_summary_df["Jumlah"],
-                textposition="auto",
-            )
-        ]
-    )
-    fig.update_layout(
-        title="Distribusi Karyawan Berdasarkan Kategori & Jenis Kontrak (Tetap & Tidak Tetap)",
-        xaxis_title="Kategori Karyawan",
-        yaxis_title="Jumlah Karyawan",
-        height=400,
-        showlegend=False,
-        margin=dict(l=10, r=10, t=60, b=10),
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    render_chart("kategori", use_custom_order, lambda: rekap_charts.category_figure(ordered_summary_df))
 else:
     st.warning("⚠️ Kategori yang dicari tidak ditemukan dalam data.")
 
@@ -659,52 +755,15 @@ st.dataframe(
 st.divider()
 st.subheader("👥 Daftar Karyawan")
 
-employee_columns_candidates = [
-    ("Pers.No.", ["Pers.No.", "PN", "Pers No", "PersNo", "Personnel Number", "Personel Number"]),
-    ("Personnel Number", ["Personnel Number", "Nama Karyawan", "Name", "Nama"]),
-    ("Position", ["Position", "Jabatan", "Job Title"]),
-    (unit_col, [unit_col]),
-    ("Birth date", ["Birth date", "Tanggal Lahir", "Birthdate", "DOB"]),
-    (age_col if age_col else "Age of employee", [age_col if age_col else "Age of employee"]),
-    (gender_col if gender_col else "Gender Key", [gender_col if gender_col else "Gender Key"]),
-    ("ESgrp", ["ESgrp", "Person Grade", "PG"]),
-    ("Job Group Short (New)", ["Job Group Short (New)", "BOD Level", "BOD"]),
-]
-
-available_columns = []
-for display_name, candidates in employee_columns_candidates:
-    c = pick_col(df_filtered.columns, candidates)
-    if c:
-        available_columns.append(c)
-
-if available_columns:
-    employee_df = df_filtered[available_columns].copy()
-
-    # Format tanggal lahir
-    bd_col = pick_col(employee_df.columns, ["Birth date", "Tanggal Lahir", "Birthdate", "DOB"])
-    if bd_col:
-        employee_df[bd_col] = pd.to_datetime(employee_df[bd_col], errors="coerce").dt.strftime("%d/%m/%Y")
-
-    # Convert ke string untuk stabilitas render
-    for col in employee_df.columns:
-        employee_df[col] = employee_df[col].astype(str)
-
-    # Mapping nama tampilan
-    column_display_names = {
-        pick_col(employee_df.columns, ["Pers.No.", "PN", "Pers No", "PersNo"]): "NIK SAP",
-        pick_col(employee_df.columns, ["Personnel Number", "Nama Karyawan", "Name", "Nama"]): "Nama Karyawan",
-        pick_col(employee_df.columns, ["Position", "Jabatan", "Job Title"]): "Jabatan",
-        unit_col: "Unit Kerja",
-        bd_col: "TGL LAHIR",
-        (age_col if age_col else pick_col(employee_df.columns, ["Age of employee", "Age", "Usia"])): "Usia",
-        (gender_col if gender_col else pick_col(employee_df.columns, ["Gender Key", "Gender", "Jenis Kelamin"])): "Jenis Kelamin",
-        pick_col(employee_df.columns, ["ESgrp", "Person Grade", "PG"]): "Person Grade",
-        pick_col(employee_df.columns, ["Job Group Short (New)", "BOD Level", "BOD"]): "BOD Level",
-    }
-    column_display_names = {k: v for k, v in column_display_names.items() if k}
-
-    employee_df = employee_df.rename(columns=column_display_names)
-
+if df_filtered is None:
+    # Mode partisi + Semua Unit: cukup total manifest; daftar per unit saat unit dipilih
+    employee_df = None
+    st.info("📂 Pilih unit kerja di atas untuk menampilkan daftar karyawannya.")
+else:
+    employee_df = engine.build_employee_table(df_filtered, unit_col)
+    if employee_df is None:
+        st.warning("⚠️ Kolom karyawan tidak ditemukan dalam data.")
+if employee_df is not None:
     st.dataframe(
         employee_df,
         use_container_width=True,
@@ -712,138 +771,50 @@ if available_columns:
         column_config={col: st.column_config.TextColumn(width=150) for col in employee_df.columns},
     )
     st.info(f"📊 Total karyawan ditampilkan: {len(employee_df)}")
-else:
-    st.warning("⚠️ Kolom karyawan tidak ditemukan dalam data.")
 
-st.info(f"✅ Menampilkan data {display_unit} | Data dimuat dari: {LOCAL_FILE if Path(LOCAL_FILE).exists() else 'GitHub remote'}")
+if partitions is not None:
+    data_source = f"partisi {PARTITION_DIR} (versi {partitions.version})"
+else:
+    data_source = LOCAL_FILE if Path(LOCAL_FILE).exists() else 'GitHub remote'
+st.info(f"✅ Menampilkan data {display_unit} | Data dimuat dari: {data_source}")
 
 
 # ==================== SECTION STRUKTUR ORGANISASI ====================
 st.divider()
 st.header("🏛️ Struktur Organisasi & Vacant Tracking")
 
-org_sheets, org_error = load_org_sheets(ORG_STRUCTURE_FILE if Path(ORG_STRUCTURE_FILE).exists() else ORG_STRUCTURE_URL)
-
 if org_error:
     st.info(f"ℹ️ Menunggu file Struktur Organisasi: {org_error}")
-elif org_sheets:
-    sheets_lower = {s.lower(): s for s in org_sheets.keys()}
-    if "struktur organisasi" in sheets_lower and "database vacant" in sheets_lower:
-        org_df = org_sheets[sheets_lower["struktur organisasi"]].copy()
-        vacant_df = org_sheets[sheets_lower["database vacant"]].copy()
-
-        # Deteksi Kolom (org)
-        u_col_org = pick_col(org_df.columns, ["Unit Kerja", "UNIT KERJA", "Unit", "UNIT"])
-        b_col_org = pick_col(org_df.columns, ["BAGIAN", "DEPARTMENT", "DEPT", "Bagian"])
-
-        # Deteksi Kolom (vacant DB)
-        u_col_vac = pick_col(vacant_df.columns, ["Unit Kerja", "UNIT KERJA", "Unit", "UNIT"])
-        b_col_vac = pick_col(vacant_df.columns, ["BAGIAN", "DEPARTMENT", "DEPT", "Bagian"])
-        jab_vac_col = pick_col(vacant_df.columns, ["JABATAN", "Jabatan", "Position"])
-
+elif use_org_partitions or org_sheets:
+    org_df, vacant_df = (None, None) if use_org_partitions else engine.split_org_sheets(org_sheets)
+    if use_org_partitions or org_df is not None:
         col_a, col_b = st.columns(2)
 
         # --- FILTER 1: UNIT KERJA ---
         with col_a:
-            org_unit_list = sorted(org_df[u_col_org].dropna().unique().tolist()) if u_col_org else []
+            org_unit_list = partitions.org_units if use_org_partitions else engine.list_org_units(org_df)
             sel_org_unit = st.selectbox("Pilih Unit Kerja:", org_unit_list, key="org_u")
 
-        # Filter data awal berdasarkan Unit
-        if u_col_org and sel_org_unit:
-            temp_df = org_df[org_df[u_col_org].astype(str) == sel_org_unit].copy()
-        else:
-            temp_df = org_df.copy()
+        # Mode partisi: load Struktur Organisasi + Database Vacant unit terpilih saja
+        if use_org_partitions:
+            org_df, vacant_df = load_org_partition(partitions, sel_org_unit)
 
         # --- FILTER 2: BAGIAN (Dynamic Dropdown) ---
-        final_org_df = temp_df.copy()
+        sel_bagian = None
         with col_b:
-            if b_col_org:
-                bagian_list = ["Semua Bagian"] + sorted(temp_df[b_col_org].dropna().unique().tolist())
+            bagian_list = engine.list_org_bagian(engine.filter_org_unit(org_df, sel_org_unit))
+            if bagian_list is not None:
                 sel_bagian = st.selectbox("Pilih Bagian/Divisi:", bagian_list, key="org_b")
-                if sel_bagian != "Semua Bagian":
-                    final_org_df = temp_df[temp_df[b_col_org].astype(str) == sel_bagian]
-
-        # Kolom inti untuk status
-        pn_col = pick_col(final_org_df.columns, ["PN", "Pers.No.", "Personnel Number", "NIK", "NIK SAP"])
-        nama_col = pick_col(final_org_df.columns, ["NAMA", "Nama", "Name"])
-        jab_col = pick_col(final_org_df.columns, ["JABATAN", "Jabatan", "Position"])
-
-        # Helper normalisasi string
-        def norm_str(x: object) -> str:
-            try:
-                s = str(x).strip()
-            except Exception:
-                return ""
-            return s
-
-        # Nilai yang dianggap "negatif/kosong"
-        NEG_VALUES = {"", "nan", "none", "null", "-", "0"}
-
-        # Deteksi PN valid (bukan kosong & bukan nol)
-        def has_valid_pn(row) -> bool:
-            val = row.get(pn_col, None) if pn_col else None
-            if val is None:
-                return False
-            s = norm_str(val).lower()
-            if s in NEG_VALUES:
-                return False
-            # Jika numerik dan > 0 -> valid
-            try:
-                # Tangani string numerik dengan koma/titik
-                sn = s.replace(",", "").replace(" ", "")
-                # kalau format float dengan .0 (contoh: 12345.0)
-                f = float(sn)
-                if f <= 0:
-                    return False
-                return True
-            except Exception:
-                # Jika bukan numerik, selama bukan nilai negatif, anggap valid (PN alfanumerik)
-                return True
-
-        # Fallback, kalau PN tidak ada: Nama terisi bisa menjadi indikator "TERISI"
-        def has_name(row) -> bool:
-            if not nama_col:
-                return False
-            s = norm_str(row.get(nama_col, "")).lower()
-            return s not in NEG_VALUES
-
-        # Siapkan set jabatan VACANT terfilter berdasarkan Unit/Bagian yang dipilih
-        if jab_vac_col:
-            vac_df_filtered = vacant_df.copy()
-
-            # Filter per Unit bila kolom Unit ada pada vacant database
-            if u_col_vac and sel_org_unit:
-                vac_df_filtered = vac_df_filtered[vac_df_filtered[u_col_vac].astype(str) == sel_org_unit]
-
-            # Filter per Bagian bila dipilih spesifik dan ada kolom Bagian pada vacant DB
-            if b_col_vac and b_col_org and 'sel_bagian' in locals() and sel_bagian and sel_bagian != "Semua Bagian":
-                vac_df_filtered = vac_df_filtered[vac_df_filtered[b_col_vac].astype(str) == sel_bagian]
-
-            vacant_set = set(vac_df_filtered[jab_vac_col].dropna().astype(str).str.strip().str.upper().tolist())
-        else:
-            vacant_set = set()
-
-        # Penentuan status baris
-        def check_status(row) -> str:
-            # 1) Jika PN valid → TERISI (prioritas tertinggi)
-            if has_valid_pn(row) or has_name(row):
-                return "🟢 TERISI"
-
-            # 2) Jika tidak ada PN/Nama: cek apakah jabatan ini tercantum VACANT pada unit/bagian ini
-            jv = norm_str(row.get(jab_col, "")).upper() if jab_col else ""
-            if jv and jv in vacant_set:
-                return "🔴 VACANT (DB)"
 
-            # 3) Default: VACANT
-            return "🔴 VACANT"
+        # Penentuan status baris (TERISI / VACANT (DB) / VACANT)
+        final_org_df = engine.compute_org_status(org_df, vacant_df, sel_org_unit, sel_bagian)
+        org_counts = engine.org_status_counts(final_org_df)
 
-        final_org_df["STATUS"] = final_org_df.apply(check_status, axis=1)
-        
         # Display Metrics Organisasi
         m1, m2, m3 = st.columns(3)
-        m1.metric("Total Posisi", len(final_org_df))
-        m2.metric("Terisi", int((final_org_df["STATUS"] == "🟢 TERISI").sum()))
-        m3.metric("Vacant", int(final_org_df["STATUS"].str.contains("🔴").sum()))
+        m1.metric("Total Posisi", org_counts["total_posisi"])
+        m2.metric("Terisi", org_counts["terisi"])
+        m3.metric("Vacant", org_counts["vacant"])
 
         # Tampilkan Tabel
         st.dataframe(final_org_df, use_container_width=True, hide_index=True)
@@ -0,0 +1,73 @@
+# tests/conftest.py
+# ==========================================
+# 🧪 Fixture bersama: dataset sintetis kecil + path workbook bawaan repo
+# ==========================================
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+EMPLOYEE_WORKBOOK = ROOT / "Cek Test Profile.xlsx"
+ORG_WORKBOOK = ROOT / "Struktur Organisasi.xlsx"
+
+
+def make_employees(version="emp-v1", extra_rows=0) -> pd.DataFrame:
+    """Database utama sintetis (3 unit); `extra_rows` menambah karyawan di Unit A."""
+    rows = [
+        ("1001", "Budi Santoso", "Mandor Tanaman", "Unit A", "Karpel - Tetap", "L", 28),
+        ("1002", "Siti Aminah", "Asisten Kebun", "Unit A", "Karpim - Tetap", "P", 35),
+        ("1003", "Ahmad Fauzi", "Mandor Panen", "Unit B", "Karpel - Tetap", "L", 45),
+        ("10031", "Rina Wati", "Krani Afdeling", "Unit B", "Karpel - Tidak Tetap", "P", 22),
+        ("2001", "Muhammad Rizki", "Manajer Kebun", "Unit C", "Karpim - Tetap", "L", 52),
+    ]
+    rows += [
+        (str(3000 + i), f"Tambahan {i}", "Pekerja", "Unit A", "Karpel - Tetap", "L", 30)
+        for i in range(extra_rows)
+    ]
+    df = pd.DataFrame(
+        rows,
+        columns=["Pers.No.", "Nama Karyawan", "Jabatan", "Personnel Subarea", "Employee Group", "Gender Key", "Age of employee"],
+    )
+    df.attrs["content_hash"] = version
+    return df
+
+
+def make_org_sheets(version="org-v1") -> dict:
+    """Workbook Struktur Organisasi sintetis (sheet Struktur Organisasi + Database Vacant)."""
+    org_df = pd.DataFrame(
+        [
+            ("Unit A", "TANAMAN", "Mandor Tanaman", "1001"),
+            ("Unit A", "TANAMAN", "Asisten Kebun", "1002"),
+            ("Unit A", "PABRIK", "Masinis", None),
+            ("Unit B", "TANAMAN", "Mandor Panen", "1003"),
+        ],
+        columns=["Unit Kerja", "BAGIAN", "JABATAN", "PN"],
+    )
+    vacant_df = pd.DataFrame([("Unit B", "TANAMAN", "Mandor Panen")], columns=["Unit Kerja", "BAGIAN", "JABATAN"])
+    org_df.attrs["content_hash"] = version
+    vacant_df.attrs["content_hash"] = version
+    return {"Struktur Organisasi": org_df, "Database Vacant": vacant_df}
+
+
+class FakeClock:
+    """Jam monotonic palsu untuk SourceCache / DatasetProvider."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
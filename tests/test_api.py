@@ -0,0 +1,146 @@
+# tests/test_api.py
+# ==========================================
+# 🌐 API JSON via create_app (ASGI in-process, tanpa server)
+# ETag 200/304/404, validasi parameter sebelum If-None-Match, reload file lokal.
+# ==========================================
+
+import asyncio
+import json
+
+import pytest
+
+import rekap_api
+from conftest import make_employees, make_org_sheets
+from rekap_loader import Dataset
+
+
+def call(app, path, query="", headers=None, method="GET"):
+    """Jalankan satu request ke ASGI app → (status, headers, body JSON/None)."""
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query.encode("utf-8"),
+        "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in (headers or {}).items()],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    response_headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in start["headers"]}
+    return start["status"], response_headers, (json.loads(body) if body else None)
+
+
+class _Loader:
+    def __init__(self, version="v1"):
+        self.version = version
+        self.previous = []
+        self.error = None
+
+    def __call__(self, previous):
+        self.previous.append(previous)
+        if self.error:
+            return None, self.error
+        if previous is not None and previous.version == self.version:
+            return previous, None
+        dataset = Dataset(make_employees(self.version), make_org_sheets(), version=self.version)
+        return dataset, None
+
+
+@pytest.fixture
+def loader():
+    return _Loader()
+
+
+@pytest.fixture
+def app(loader, clock):
+    provider = rekap_api.DatasetProvider("https://example.invalid/db.xlsx", None, ttl=60, loader=loader, clock=clock)
+    return rekap_api.create_app(provider)
+
+
+def test_rekap_200_then_304(app):
+    status, headers, body = call(app, "/api/rekap", "unit=Unit+A")
+    assert status == 200
+    assert headers["etag"] == '"v1"'
+    assert body["version"] == "v1"
+    assert body["total_karyawan"] == 2
+
+    status, headers, body = call(app, "/api/rekap", "unit=Unit+A", {"If-None-Match": '"v1"'})
+    assert status == 304
+    assert headers["etag"] == '"v1"'
+    assert body is None
+
+
+def test_stale_etag_gets_fresh_200(app):
+    status, _, body = call(app, "/api/demografi", "unit=Unit+B", {"If-None-Match": '"v0"'})
+    assert status == 200
+    assert body["gender"] == {"male": 1, "female": 1, "other": 0}
+
+
+def test_unknown_unit_is_404_even_with_matching_etag(app):
+    assert call(app, "/api/rekap", "unit=NOPE")[0] == 404
+    status, _, body = call(app, "/api/rekap", "unit=NOPE", {"If-None-Match": '"v1"'})
+    assert status == 404
+    assert "NOPE" in body["error"]
+    assert call(app, "/api/demografi", "unit=NOPE", {"If-None-Match": "*"})[0] == 404
+
+
+def test_unknown_org_unit_is_404(app):
+    assert call(app, "/api/vacant", "unit=Unit+B", {"If-None-Match": '"v1"'})[0] == 304
+    assert call(app, "/api/vacant", "unit=NOPE", {"If-None-Match": '"v1"'})[0] == 404
+    status, _, body = call(app, "/api/vacant", "unit=Unit+A")
+    assert status == 200
+    assert (body["total_posisi"], body["terisi"], body["vacant"]) == (3, 2, 1)
+
+
+def test_unknown_endpoint_and_method(app):
+    assert call(app, "/api/tidak-ada")[0] == 404
+    assert call(app, "/api/rekap", method="POST")[0] == 405
+
+
+def test_new_version_changes_etag_after_ttl(app, loader, clock):
+    call(app, "/api/version")
+    loader.version = "v2"
+    assert call(app, "/api/version", headers={"If-None-Match": '"v1"'})[0] == 304  # TTL belum habis
+
+    clock.advance(60)
+    status, headers, body = call(app, "/api/version", headers={"If-None-Match": '"v1"'})
+    assert status == 200
+    assert headers["etag"] == '"v2"'
+    assert loader.previous[-1].version == "v1"
+
+
+def test_failed_first_load_is_503(loader, clock):
+    loader.error = "sumber tidak tersedia"
+    provider = rekap_api.DatasetProvider("https://example.invalid/db.xlsx", ttl=60, loader=loader, clock=clock)
+    status, _, body = call(rekap_api.create_app(provider), "/api/rekap")
+    assert status == 503
+    assert "sumber tidak tersedia" in body["error"]
+
+
+def test_replaced_local_file_is_picked_up_without_ttl(tmp_path, clock):
+    path = tmp_path / "db.xlsx"
+    path.write_bytes(b"isi-1")
+    loads = []
+
+    def load(previous):
+        loads.append(previous)
+        version = path.read_bytes().decode()
+        return Dataset(make_employees(version), version=version), None
+
+    provider = rekap_api.DatasetProvider(str(path), ttl=3600, loader=load, clock=clock)
+    app = rekap_api.create_app(provider)
+    assert call(app, "/api/version")[2]["version"] == "isi-1"
+    assert call(app, "/api/version")[2]["version"] == "isi-1"
+    assert len(loads) == 1  # file sama → tidak reload
+
+    path.write_bytes(b"isi-2 baru")
+    assert call(app, "/api/version")[2]["version"] == "isi-2 baru"
+    assert len(loads) == 2
@@ -0,0 +1,82 @@
+# tests/test_charts.py
+# ==========================================
+# 📈 Payload chart ringkas & instrumentasi CHART_STATS
+# ==========================================
+
+import json
+import time
+
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+import rekap_charts
+
+
+@pytest.fixture(autouse=True)
+def _clean_stats():
+    rekap_charts.reset_stats()
+    yield
+    rekap_charts.reset_stats()
+
+
+def _age_figure():
+    labels = ["<25", "25-34", "35-44"]
+    return rekap_charts.age_figure(labels, pd.Series([3, 5, 2], index=labels))
+
+
+def test_compact_spec_drops_template_and_uses_plain_lists():
+    spec = rekap_charts.compact_spec(_age_figure())
+    assert spec["layout"]["template"] == {}
+    assert spec["data"][0]["y"] == [3, 5, 2]
+    assert spec["data"][0]["x"] == ["<25", "25-34", "35-44"]
+    # Spec bisa dipakai ulang sebagai figure tanpa kehilangan data
+    assert list(go.Figure(spec).data[1].y) == [3, 5, 2]
+
+    full = len(_age_figure().to_json())
+    assert len(json.dumps(spec)) < full
+
+
+def test_category_figure_follows_table_order():
+    summary = pd.DataFrame({"Kategori": ["Pimpinan", "Staf"], "Jumlah": [4, 9]})
+    spec = rekap_charts.compact_spec(rekap_charts.category_figure(summary))
+    assert spec["data"][0]["x"] == ["Pimpinan", "Staf"]
+    assert spec["data"][0]["y"] == [4, 9]
+
+
+def test_figure_payload_records_build_and_payload_size():
+    spec = rekap_charts.figure_payload("usia", _age_figure)
+    rekap_charts.figure_payload("usia", _age_figure)
+
+    stats = rekap_charts.chart_stats()["usia"]
+    assert stats["builds"] == 2
+    assert stats["payload_bytes"] == len(json.dumps(spec, separators=(",", ":")).encode("utf-8"))
+    assert stats["avg_serialize_ms"] > 0
+    assert stats["max_serialize_ms"] >= stats["avg_serialize_ms"]
+
+
+def test_serialize_time_excludes_build_time():
+    def slow_build():
+        time.sleep(0.2)
+        return _age_figure()
+
+    rekap_charts.figure_payload("usia", slow_build)
+    stats = rekap_charts.chart_stats()["usia"]
+    assert stats["avg_build_ms"] >= 200
+    assert stats["avg_serialize_ms"] < 200
+    assert stats["max_serialize_ms"] < 200
+
+
+def test_render_hit_rate_and_reset():
+    for _ in range(4):
+        rekap_charts.record_render("usia")
+    rekap_charts.figure_payload("usia", _age_figure)
+    rekap_charts.record_render("kategori")
+
+    stats = rekap_charts.chart_stats()
+    assert list(stats) == ["kategori", "usia"]
+    assert (stats["usia"]["renders"], stats["usia"]["builds"], stats["usia"]["hit_rate"]) == (4, 1, 0.75)
+    assert stats["kategori"]["hit_rate"] == 1.0 and stats["kategori"]["avg_serialize_ms"] == 0.0
+
+    rekap_charts.reset_stats()
+    assert rekap_charts.chart_stats() == {}
@@ -0,0 +1,49 @@
+# tests/test_cli.py
+# ==========================================
+# 🖥️ CLI batch: report paralel = serial, file output per format
+# ==========================================
+
+import json
+
+import pytest
+
+import rekap_cli
+import rekap_engine as engine
+from conftest import make_employees, make_org_sheets
+
+
+def test_parallel_reports_match_serial():
+    df = make_employees()
+    serial = rekap_cli.generate_reports(df, workers=1)
+    assert list(serial) == [engine.ALL_UNITS, "Unit A", "Unit B", "Unit C"]
+    assert rekap_cli.generate_reports(df, workers=2) == serial
+    assert serial["Unit B"]["total_karyawan"] == 2
+
+
+def test_generate_reports_requires_core_columns():
+    with pytest.raises(ValueError):
+        rekap_cli.generate_reports(make_employees().drop(columns=["Employee Group"]), workers=1)
+
+
+def test_write_outputs_json_and_csv(tmp_path):
+    reports = rekap_cli.generate_reports(make_employees(), workers=1)
+    org_reports = engine.build_org_reports(make_org_sheets())
+
+    [json_path] = rekap_cli.write_outputs(reports, org_reports, "json", tmp_path / "json", {"source": "uji"})
+    payload = json.loads(json_path.read_text(encoding="utf-8"))
+    assert payload["source"] == "uji"
+    assert payload["units"]["Unit A"]["total_karyawan"] == 2
+    assert payload["struktur_organisasi"]["Unit A"] == {"total_posisi": 3, "terisi": 2, "vacant": 1}
+
+    written = rekap_cli.write_outputs(reports, org_reports, "csv", tmp_path / "csv", {})
+    assert {p.name for p in written} == {f"{name}.csv" for name in engine.reports_to_tables(reports, org_reports)}
+
+    with pytest.raises(ValueError):
+        rekap_cli.write_outputs(reports, org_reports, "txt", tmp_path / "txt", {})
+
+
+def test_main_writes_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(rekap_cli.loader, "load_excel_data", lambda source, sheet_name=0: (make_employees(), None))
+    monkeypatch.setattr(rekap_cli.loader, "load_org_sheets", lambda source: (make_org_sheets(), None))
+    assert rekap_cli.main(["--format", "json", "--output", str(tmp_path), "--workers", "1"]) == 0
+    assert (tmp_path / "rekap.json").exists()
@@ -0,0 +1,74 @@
+# tests/test_engine.py
+# ==========================================
+# 🧮 Engine vs skrip lama pada workbook bawaan repo
+# Angka acuan dicatat dari streamlit_app.py sebelum engine dipisah (metric &
+# tabel summary yang tampil di dashboard untuk unit yang sama).
+# ==========================================
+
+import pytest
+
+import rekap_engine as engine
+import rekap_loader
+from conftest import EMPLOYEE_WORKBOOK, ORG_WORKBOOK
+
+# unit → (total, tetap, tidak tetap, jumlah kategori, laki-laki, perempuan, disabilitas, usia, summary)
+GOLDEN = {
+    engine.ALL_UNITS: (5680, 3461, 0, 2, 5322, 358, 5680, [153, 411, 1277, 2535, 1220, 84],
+                       [("Karpim - Tetap", 659), ("Karpel - Tetap", 2802)]),
+    "Sei Semayang": (83, 77, 0, 2, 79, 4, 83, [1, 27, 26, 5, 23, 1],
+                     [("Karpim - Tetap", 10), ("Karpel - Tetap", 67)]),
+    "Wringinanom": (75, 41, 0, 2, 70, 5, 75, [0, 1, 19, 31, 24, 0],
+                    [("Karpim - Tetap", 14), ("Karpel - Tetap", 27)]),
+}
+
+pytestmark = pytest.mark.skipif(not EMPLOYEE_WORKBOOK.exists(), reason="Workbook bawaan tidak ada")
+
+
+@pytest.fixture(scope="module")
+def employees():
+    df, error = rekap_loader.load_excel_data(str(EMPLOYEE_WORKBOOK))
+    assert error is None
+    return df
+
+
+def test_units_match_old_dropdown(employees):
+    unit_col, eg_col = engine.detect_core_columns(employees)
+    assert unit_col and eg_col
+    units = engine.list_units(employees, unit_col)
+    assert len(units) == 34
+    assert {"Sei Semayang", "Wringinanom"} <= set(units)
+
+
+@pytest.mark.parametrize("unit", sorted(GOLDEN))
+def test_unit_report_matches_old_script(employees, unit):
+    total, tetap, tidak_tetap, kategori, male, female, disability, ages, summary = GOLDEN[unit]
+    report = engine.build_unit_report(employees, unit)
+
+    assert report["total_karyawan"] == total
+    assert report["total_tetap"] == tetap
+    assert report["total_tidak_tetap"] == tidak_tetap
+    assert report["num_kategori"] == kategori
+    assert (report["gender"]["male"], report["gender"]["female"]) == (male, female)
+    assert report["disability"] == disability
+    assert report["age_counts"].tolist() == ages
+    ordered = engine.order_summary(report["summary"], True)
+    assert list(zip(ordered["Kategori"], ordered["Jumlah"])) == summary
+
+
+def test_report_dict_round_trip(employees):
+    report = engine.build_unit_report(employees, "Sei Semayang")
+    restored = engine.report_from_dict(engine.report_to_dict(report))
+    assert restored["total_karyawan"] == report["total_karyawan"]
+    assert restored["age_counts"].tolist() == report["age_counts"].tolist()
+    assert restored["summary"].equals(report["summary"])
+
+
+@pytest.mark.skipif(not ORG_WORKBOOK.exists(), reason="Workbook Struktur Organisasi tidak ada")
+def test_org_status_matches_old_script():
+    sheets, error = rekap_loader.load_org_sheets(str(ORG_WORKBOOK))
+    assert error is None
+    org_df, vacant_df = engine.split_org_sheets(sheets)
+    first_unit = engine.list_org_units(org_df)[0]
+    counts = engine.org_status_counts(engine.compute_org_status(org_df, vacant_df, first_unit, engine.ALL_BAGIAN))
+    assert counts == {"total_posisi": 31, "terisi": 20, "vacant": 11}
+    assert engine.build_org_reports(sheets)[str(first_unit)] == counts
@@ -0,0 +1,298 @@
+# tests/test_loader.py
+# ==========================================
+# 📦 Loader: identitas file (hash isi), load *_if_changed, WorkbookWatcher,
+# SourceCache (single-flight, stale-while-revalidate, retry_after) dengan FakeClock
+# ==========================================
+
+import os
+import threading
+import time
+
+import pandas as pd
+
+import rekap_loader
+from conftest import make_employees, make_org_sheets
+from rekap_loader import SourceCache
+
+
+def _write_employees_xlsx(path, extra_rows=0):
+    make_employees(extra_rows=extra_rows).to_excel(path, index=False)
+
+
+def _write_org_xlsx(path):
+    with pd.ExcelWriter(path) as writer:
+        for name, sheet in make_org_sheets().items():
+            sheet.to_excel(writer, sheet_name=name, index=False)
+
+
+def _touch(path, seconds=10):
+    """Ubah mtime tanpa mengubah isi."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+# -----------------------------
+# Identitas file
+# -----------------------------
+def test_file_identity_tracks_content(tmp_path):
+    path = tmp_path / "db.xlsx"
+    path.write_bytes(b"isi-1")
+    first = rekap_loader.file_identity(str(path))
+    assert first.sha256 == rekap_loader.content_hash(b"isi-1")
+
+    rekap_loader.write_workbook(str(path), b"isi-2 lebih panjang")
+    assert rekap_loader.file_identity(str(path)).sha256 == rekap_loader.content_hash(b"isi-2 lebih panjang")
+    assert rekap_loader.file_identity(str(tmp_path / "tidak-ada.xlsx")) is None
+    assert rekap_loader.file_identity("https://example.invalid/db.xlsx") is None
+
+
+# -----------------------------
+# Load berbasis hash isi
+# -----------------------------
+def test_excel_version_is_content_hash(tmp_path):
+    path = tmp_path / "db.xlsx"
+    _write_employees_xlsx(path)
+    df, error = rekap_loader.load_excel_data(str(path))
+    assert error is None
+    assert rekap_loader.data_version(df) == rekap_loader.content_hash(path.read_bytes())
+    assert len(df) == 5
+
+
+def test_load_excel_if_changed_skips_same_content(tmp_path):
+    path = tmp_path / "db.xlsx"
+    _write_employees_xlsx(path)
+    first, _ = rekap_loader.load_excel_if_changed(str(path))
+
+    _touch(path)  # mtime berubah, isi sama → tetap objek yang sama (tanpa parse ulang)
+    assert rekap_loader.load_excel_if_changed(str(path), first)[0] is first
+
+    _write_employees_xlsx(path, extra_rows=2)
+    changed, error = rekap_loader.load_excel_if_changed(str(path), first)
+    assert error is None
+    assert changed is not first and len(changed) == 7
+
+
+def test_load_org_sheets_if_changed_skips_same_content(tmp_path):
+    path = tmp_path / "org.xlsx"
+    _write_org_xlsx(path)
+    first, error = rekap_loader.load_org_sheets_if_changed(str(path))
+    assert error is None
+    assert {"Struktur Organisasi", "Database Vacant"} <= set(first)
+    assert rekap_loader.load_org_sheets_if_changed(str(path), first)[0] is first
+
+
+def test_load_dataset_reuses_previous_when_unchanged(tmp_path):
+    emp_path, org_path = tmp_path / "db.xlsx", tmp_path / "org.xlsx"
+    _write_employees_xlsx(emp_path)
+    _write_org_xlsx(org_path)
+    first, error = rekap_loader.load_dataset(str(emp_path), str(org_path))
+    assert error is None and first.org_error is None
+    assert rekap_loader.load_dataset(str(emp_path), str(org_path), previous=first)[0] is first
+
+    _write_employees_xlsx(emp_path, extra_rows=1)
+    second, _ = rekap_loader.load_dataset(str(emp_path), str(org_path), previous=first)
+    assert second.version != first.version
+    assert second.org_sheets is first.org_sheets  # org tidak berubah → tidak di-parse ulang
+
+
+def test_load_missing_file_returns_error(tmp_path):
+    df, error = rekap_loader.load_excel_if_changed(str(tmp_path / "tidak-ada.xlsx"))
+    assert df is None and error
+
+
+# -----------------------------
+# WorkbookWatcher
+# -----------------------------
+def test_watcher_check_fires_only_on_content_change(tmp_path):
+    path = tmp_path / "db.xlsx"
+    path.write_bytes(b"isi-1")
+    changes = []
+    watcher = rekap_loader.WorkbookWatcher([str(path)], lambda p, identity: changes.append((p, identity.sha256)))
+    abs_path = os.path.abspath(path)
+
+    assert watcher.check(abs_path) is False
+    _touch(path)
+    assert watcher.check(abs_path) is False
+    path.write_bytes(b"isi-2")
+    assert watcher.check(abs_path) is True
+    assert changes == [(abs_path, rekap_loader.content_hash(b"isi-2"))]
+    assert watcher.check(abs_path) is False
+
+
+def test_watcher_survives_on_change_error(tmp_path):
+    path = tmp_path / "db.xlsx"
+    path.write_bytes(b"isi-1")
+
+    def broken(path, identity):
+        raise RuntimeError("gagal")
+
+    watcher = rekap_loader.WorkbookWatcher([str(path)], broken)
+    path.write_bytes(b"isi-2")
+    assert watcher.check(os.path.abspath(path)) is True
+
+
+def test_watcher_debounces_bursts(tmp_path):
+    path = tmp_path / "db.xlsx"
+    path.write_bytes(b"isi-1")
+    fired = threading.Event()
+    calls = []
+
+    def on_change(path, identity):
+        calls.append(identity.sha256)
+        fired.set()
+
+    watcher = rekap_loader.WorkbookWatcher([str(path)], on_change, debounce=0.1)
+    abs_path = os.path.abspath(path)
+    for i in range(5):  # penulisan bertahap → satu on_change dengan isi akhir
+        path.write_bytes(f"isi-{i + 2}".encode())
+        watcher._schedule(abs_path)
+    assert fired.wait(5)
+    time.sleep(0.2)
+    watcher.stop()
+    assert calls == [rekap_loader.content_hash(b"isi-6")]
+
+
+# -----------------------------
+# SourceCache
+# -----------------------------
+KEY = "https://example.invalid/db.xlsx"
+
+
+def _wait_idle(cache, key, timeout=5.0):
+    """Tunggu sampai tidak ada load/refresh yang berjalan untuk key."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with cache._lock:
+            entry = cache._entries.get(key)
+            if entry is None or entry.inflight is None:
+                return
+        time.sleep(0.005)
+    raise AssertionError("refresh tidak selesai")
+
+
+class _Loader:
+    """Loader palsu: hasil berurutan v1, v2, ...; bisa ditahan lewat `gate`."""
+
+    def __init__(self, fail_on=()):
+        self.calls = []
+        self.fail_on = set(fail_on)
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, key, previous):
+        self.calls.append(previous)
+        self.started.set()
+        assert self.gate.wait(5)
+        n = len(self.calls)
+        if n in self.fail_on:
+            return None, f"gagal #{n}"
+        return f"v{n}", None
+
+
+def test_single_flight_first_load(clock):
+    loader = _Loader()
+    loader.gate.clear()
+    cache = SourceCache(loader, ttl=60, clock=clock)
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get(KEY))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    assert loader.started.wait(5)
+    time.sleep(0.05)  # beri waktu sesi lain ikut menunggu load yang sama
+    loader.gate.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(loader.calls) == 1
+    assert results == [("v1", None)] * 8
+
+
+def test_fresh_value_served_without_reload(clock):
+    loader = _Loader()
+    cache = SourceCache(loader, ttl=60, clock=clock)
+    assert cache.get(KEY) == ("v1", None)
+    clock.advance(59)
+    assert cache.get(KEY) == ("v1", None)
+    assert len(loader.calls) == 1
+
+
+def test_stale_while_revalidate(clock):
+    loader = _Loader()
+    cache = SourceCache(loader, ttl=60, clock=clock)
+    assert cache.get(KEY) == ("v1", None)
+
+    clock.advance(60)
+    loader.gate.clear()
+    # TTL habis: nilai lama langsung disajikan, refresh berjalan di background
+    assert cache.get(KEY) == ("v1", None)
+    assert cache.get(KEY) == ("v1", None)
+    loader.gate.set()
+    _wait_idle(cache, KEY)
+
+    assert loader.calls == [None, "v1"]  # refresh menerima nilai sebelumnya
+    assert cache.get(KEY) == ("v2", None)
+
+
+def test_failed_refresh_keeps_value_and_waits_retry_after(clock):
+    loader = _Loader(fail_on={2})
+    cache = SourceCache(loader, ttl=60, retry_after=30, clock=clock)
+    cache.get(KEY)
+
+    clock.advance(60)
+    assert cache.get(KEY) == ("v1", None)
+    _wait_idle(cache, KEY)
+    assert cache.get(KEY) == ("v1", None)
+    assert cache.last_error(KEY) == "gagal #2"
+
+    # Masih dalam retry_after: tidak ada percobaan baru walau nilai sudah stale
+    clock.advance(29)
+    cache.get(KEY)
+    _wait_idle(cache, KEY)
+    assert len(loader.calls) == 2
+
+    clock.advance(1)
+    cache.get(KEY)
+    _wait_idle(cache, KEY)
+    assert len(loader.calls) == 3
+    assert cache.get(KEY) == ("v3", None)
+    assert cache.last_error(KEY) is None
+
+
+def test_failed_first_load_is_not_retried_before_retry_after(clock):
+    loader = _Loader(fail_on={1})
+    cache = SourceCache(loader, ttl=60, retry_after=30, clock=clock)
+    assert cache.get(KEY) == (None, "gagal #1")
+    clock.advance(10)
+    assert cache.get(KEY) == (None, "gagal #1")
+    assert len(loader.calls) == 1
+
+    clock.advance(20)
+    assert cache.get(KEY) == ("v2", None)
+
+
+def test_loader_exception_releases_waiters(clock):
+    def boom(key, previous):
+        raise RuntimeError("rusak")
+
+    cache = SourceCache(boom, clock=clock)
+    assert cache.get(KEY) == (None, "rusak")
+    with cache._lock:
+        assert cache._entries[KEY].inflight is None
+
+
+def test_waiter_gives_up_after_wait_timeout(clock):
+    loader = _Loader()
+    loader.gate.clear()
+    cache = SourceCache(loader, clock=clock, wait_timeout=0.05)
+    first = threading.Thread(target=cache.get, args=(KEY,))
+    first.start()
+    assert loader.started.wait(5)
+
+    value, error = cache.get(KEY)
+    assert value is None and "Timeout" in error
+
+    loader.gate.set()
+    first.join(5)
+    assert cache.get(KEY) == ("v1", None)
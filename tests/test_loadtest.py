@@ -0,0 +1,82 @@
+# tests/test_loadtest.py
+# ==========================================
+# 🏋️ Helper statistik load test (tanpa menjalankan sesi AppTest)
+# patch_apptest_for_threads TIDAK dipanggil di sini: tambalannya permanen per proses.
+# ==========================================
+
+import pytest
+
+import rekap_loadtest
+
+
+@pytest.mark.parametrize("pct, expected", [
+    (0, 1),      # rank minimal 1
+    (50, 5),
+    (90, 9),
+    (95, 10),
+    (99, 10),
+    (100, 10),
+])
+def test_percentile_nearest_rank(pct, expected):
+    values = [7, 3, 10, 1, 5, 2, 9, 4, 8, 6]  # urutan acak: percentile mengurutkan sendiri
+    assert rekap_loadtest.percentile(values, pct) == expected
+
+
+def test_percentile_edge_cases():
+    assert rekap_loadtest.percentile([], 95) == 0.0
+    assert rekap_loadtest.percentile([0.25], 50) == 0.25
+    assert rekap_loadtest.percentile([0.1, 0.2], 50) == 0.1
+
+
+def test_summarize_in_milliseconds():
+    latencies = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    assert rekap_loadtest.summarize(latencies) == {
+        "count": 100,
+        "p50_ms": 50.0,
+        "p95_ms": 95.0,
+        "p99_ms": 99.0,
+        "max_ms": 100.0,
+    }
+
+
+def test_summarize_empty():
+    assert rekap_loadtest.summarize([]) == {"count": 0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+
+
+def test_session_result_groups_by_action():
+    result = rekap_loadtest.SessionResult()
+    result.record("select_unit", 0.1)
+    result.record("select_unit", 0.3)
+    result.record("initial_load", 1.0)
+    assert result.latencies == {"select_unit": [0.1, 0.3], "initial_load": [1.0]}
+
+
+def test_format_report():
+    summary = rekap_loadtest.summarize([0.01, 0.02])
+    report = {
+        "sessions": 2,
+        "iterations": 1,
+        "wall_seconds": 1.5,
+        "reruns": 2,
+        "throughput_reruns_per_s": 1.33,
+        "latency": summary,
+        "latency_by_action": {"select_unit": summary},
+        "memory_mb": {"baseline_rss": 100.0, "peak_rss": 150.0, "final_rss": 120.0},
+        "charts": {"usia": {"renders": 4, "builds": 1, "hit_rate": 0.75, "avg_build_ms": 4.0, "avg_serialize_ms": 2.5, "payload_bytes": 1200}},
+        "errors": ["select_unit: boom"],
+        "error_count": 1,
+    }
+    text = rekap_loadtest.format_report(report)
+    assert "select_unit" in text and "TOTAL" in text
+    assert "usia" in text and "1200" in text
+    assert "❌ Error: 1" in text and "- select_unit: boom" in text
+
+    report.update(charts={}, errors=[], error_count=0)
+    text = rekap_loadtest.format_report(report)
+    assert "chart" not in text
+    assert "✅ Error: 0" in text
+
+
+def test_rss_helpers_report_megabytes():
+    assert rekap_loadtest.current_rss_mb() > 1
+    assert rekap_loadtest.peak_rss_mb() >= rekap_loadtest.current_rss_mb() * 0.5
@@ -0,0 +1,251 @@
+# tests/test_partition.py
+# ==========================================
+# 🗂️ Dataset terpartisi: build → load round-trip, rebuild idempoten, pruning versi,
+# build paralel aman, dan error partisi di dashboard (AppTest)
+# ==========================================
+
+import json
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+import rekap_engine as engine
+import rekap_loadtest
+import rekap_partition
+from conftest import ROOT, make_employees, make_org_sheets
+from rekap_partition import PartitionedDataset, build_partitions
+
+
+def _version_dirs(root):
+    return sorted(p.name for p in (root / rekap_partition.VERSIONS_DIR).iterdir() if p.is_dir())
+
+
+def _build(root, n):
+    """Build versi ke-n (isi berbeda per n) dan tandai mtime folder versinya berurutan."""
+    df = make_employees(f"emp-v{n}", extra_rows=n)
+    manifest = build_partitions(df, make_org_sheets(), root)
+    version_dir = root / rekap_partition.VERSIONS_DIR / manifest["version"]
+    os.utime(version_dir, (1000 * n, 1000 * n))
+    return df, manifest
+
+
+def test_round_trip(tmp_path):
+    df = make_employees()
+    org_sheets = make_org_sheets()
+    manifest = build_partitions(df, org_sheets, tmp_path)
+    data = PartitionedDataset(tmp_path)
+
+    assert data.version == manifest["version"] == rekap_partition.partition_version(df, org_sheets)
+    assert (data.unit_col, data.eg_col) == engine.detect_core_columns(df)
+    assert data.units == ["Unit A", "Unit B", "Unit C"]
+    assert [data.unit_rows(u) for u in data.units] == [2, 2, 1]
+    assert data.unit_rows("NOPE") == 0
+
+    for unit in data.units:
+        part = data.load_unit(unit)
+        pd.testing.assert_frame_equal(part, df[df["Personnel Subarea"] == unit])
+        report = engine.build_unit_report(part, unit)
+        assert report["total_karyawan"] == engine.build_unit_report(df, unit)["total_karyawan"]
+    with pytest.raises(KeyError):
+        data.load_unit("NOPE")
+
+    totals = data.totals()
+    expected = engine.build_unit_report(df, engine.ALL_UNITS)
+    assert totals["total_karyawan"] == expected["total_karyawan"] == 5
+    assert totals["age_counts"].tolist() == expected["age_counts"].tolist()
+    assert totals["gender"] == expected["gender"]
+
+
+def test_org_partitions(tmp_path):
+    org_sheets = make_org_sheets()
+    build_partitions(make_employees(), org_sheets, tmp_path)
+    data = PartitionedDataset(tmp_path)
+
+    assert data.has_org
+    assert data.org_units == ["Unit A", "Unit B"]
+    org_part, vacant_part = data.load_org_unit("Unit B")
+    assert org_part["JABATAN"].tolist() == ["Mandor Panen"]
+    assert vacant_part["JABATAN"].tolist() == ["Mandor Panen"]
+    # Unit tanpa baris vacant tetap dapat frame kosong dengan kolom yang sama
+    _, vacant_a = data.load_org_unit("Unit A")
+    assert vacant_a.empty and list(vacant_a.columns) == list(vacant_part.columns)
+
+    org_df, vacant_df = engine.split_org_sheets(org_sheets)
+    counts = engine.org_status_counts(engine.compute_org_status(*data.load_org_unit("Unit A"), "Unit A", engine.ALL_BAGIAN))
+    assert counts == engine.org_status_counts(engine.compute_org_status(org_df, vacant_df, "Unit A", engine.ALL_BAGIAN))
+
+
+def test_search_index_built_with_partitions(tmp_path):
+    build_partitions(make_employees(), make_org_sheets(), tmp_path)
+    data = PartitionedDataset(tmp_path)
+    index = data.load_search_index()
+
+    assert index.version == data.version
+    assert len(index) == 5
+    result = index.search("1001")[0]
+    assert result["nama"] == "Budi Santoso"
+    assert result["org"]["unit_kerja"] == "Unit A"
+
+
+def test_same_source_is_not_rewritten(tmp_path):
+    first = build_partitions(make_employees(), make_org_sheets(), tmp_path)
+    manifest_mtime = (tmp_path / rekap_partition.MANIFEST_FILE).stat().st_mtime_ns
+    second = build_partitions(make_employees(), make_org_sheets(), tmp_path)
+
+    assert second == first
+    assert (tmp_path / rekap_partition.MANIFEST_FILE).stat().st_mtime_ns == manifest_mtime
+    assert _version_dirs(tmp_path) == [first["version"]]
+
+
+def test_prune_keeps_recent_versions_and_foreign_files(tmp_path):
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    (tmp_path / "keepme").mkdir()
+    (tmp_path / "notes.txt").write_text("catatan")
+    foreign_in_versions = tmp_path / rekap_partition.VERSIONS_DIR / "backup-lama"
+    foreign_in_versions.mkdir(parents=True)
+
+    _, m1 = _build(tmp_path, 1)
+    _, m2 = _build(tmp_path, 2)
+    df3, m3 = _build(tmp_path, 3)
+
+    versions = {m1["version"], m2["version"], m3["version"]}
+    assert len(versions) == 3
+    remaining = set(_version_dirs(tmp_path)) & versions
+    assert remaining == {m2["version"], m3["version"]}  # aktif + KEEP_VERSIONS-1 terbaru
+    assert len(remaining) == rekap_partition.KEEP_VERSIONS
+
+    assert (tmp_path / ".git" / "HEAD").read_text() == "ref: refs/heads/main\n"
+    assert (tmp_path / "keepme").is_dir()
+    assert (tmp_path / "notes.txt").exists()
+    assert foreign_in_versions.is_dir()
+
+    data = PartitionedDataset(tmp_path)
+    assert data.version == m3["version"]
+    pd.testing.assert_frame_equal(data.load_unit("Unit A"), df3[df3["Personnel Subarea"] == "Unit A"])
+
+
+def test_old_manifest_format_is_rejected_then_rebuilt(tmp_path):
+    (tmp_path / rekap_partition.MANIFEST_FILE).write_text(json.dumps({"version": "lama", "units": {}}))
+    with pytest.raises(ValueError, match="Format manifest"):
+        PartitionedDataset(tmp_path)
+
+    manifest = build_partitions(make_employees(), make_org_sheets(), tmp_path)
+    assert PartitionedDataset(tmp_path).version == manifest["version"]
+
+
+def test_missing_core_columns(tmp_path):
+    with pytest.raises(ValueError):
+        build_partitions(pd.DataFrame({"Nama": ["x"]}), {}, tmp_path)
+    assert not PartitionedDataset.exists(tmp_path)
+
+
+def _build_concurrently(root, frames):
+    errors = []
+
+    def run(df):
+        try:
+            build_partitions(df, make_org_sheets(), root)
+        except Exception as e:  # pragma: no cover - hanya untuk laporan
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(df,)) for df in frames]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+    return errors
+
+
+def test_concurrent_builds_of_same_version(tmp_path):
+    # Upload + watcher memicu build versi yang sama hampir bersamaan
+    assert _build_concurrently(tmp_path, [make_employees() for _ in range(4)]) == []
+    data = PartitionedDataset(tmp_path)
+    assert _version_dirs(tmp_path) == [data.version]
+    for unit in data.units:
+        assert len(data.load_unit(unit)) == data.unit_rows(unit)
+    assert data.load_search_index().version == data.version
+
+
+def test_concurrent_builds_of_different_versions(tmp_path):
+    frames = [make_employees(f"emp-v{n}", extra_rows=n) for n in range(4)]
+    assert _build_concurrently(tmp_path, frames) == []
+    data = PartitionedDataset(tmp_path)
+    assert data.version in _version_dirs(tmp_path)
+    assert len(_version_dirs(tmp_path)) <= rekap_partition.KEEP_VERSIONS
+    assert not [p for p in (tmp_path / rekap_partition.VERSIONS_DIR).iterdir() if p.name.startswith(".tmp-")]
+    for unit in data.units:
+        assert isinstance(data.load_unit(unit), pd.DataFrame)
+
+
+def test_existing_version_folder_is_reused(tmp_path):
+    first = build_partitions(make_employees("emp-v1"), make_org_sheets(), tmp_path)
+    unit_file = tmp_path / first["units"]["Unit A"]["file"]
+    mtime = unit_file.stat().st_mtime_ns
+
+    build_partitions(make_employees("emp-v2", extra_rows=1), make_org_sheets(), tmp_path)
+    # Kembali ke isi v1: folder v1 masih ada → dipakai lagi, tidak dihapus / ditulis ulang
+    again = build_partitions(make_employees("emp-v1"), make_org_sheets(), tmp_path)
+    assert again["version"] == first["version"]
+    assert unit_file.stat().st_mtime_ns == mtime
+    assert PartitionedDataset(tmp_path).version == first["version"]
+
+
+def test_incomplete_version_folder_is_rewritten(tmp_path):
+    df = make_employees()
+    version = rekap_partition.partition_version(df, make_org_sheets())
+    leftover = tmp_path / rekap_partition.VERSIONS_DIR / version
+    (leftover / "employees").mkdir(parents=True)
+    (leftover / "employees" / "0000.pkl").write_bytes(b"setengah")
+
+    build_partitions(df, make_org_sheets(), tmp_path)
+    data = PartitionedDataset(tmp_path)
+    assert len(data.load_unit("Unit A")) == 2
+
+
+# -----------------------------
+# Dashboard mode partisi (AppTest)
+# -----------------------------
+def _run_dashboard(monkeypatch, partition_dir, unit=None):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setenv("REKAP_PARTITION_DIR", str(partition_dir))
+    at = AppTest.from_file(str(ROOT / "streamlit_app.py"), default_timeout=120)
+    at.secrets["database_url"] = "https://example.invalid/db.xlsx"
+    at.run()
+    if unit is not None and not at.exception:
+        at.selectbox(key="selected_unit").select(unit).run()
+    return at
+
+
+def test_dashboard_dropdown_shows_unit_row_counts(tmp_path, monkeypatch):
+    build_partitions(make_employees(), make_org_sheets(), tmp_path)
+    at = _run_dashboard(monkeypatch, tmp_path, unit="Unit B")
+    assert not at.exception
+    assert at.selectbox(key="selected_unit").options == [
+        engine.ALL_UNITS, "Unit A (2 karyawan)", "Unit B (2 karyawan)", "Unit C (1 karyawan)",
+    ]
+    assert rekap_loadtest.selectbox_values(at.selectbox(key="selected_unit")) == [
+        engine.ALL_UNITS, "Unit A", "Unit B", "Unit C",
+    ]
+    assert at.selectbox(key="selected_unit").value == "Unit B"
+    assert [m.value for m in at.metric if m.label == "📊 Total Karyawan"] == ["2"]
+
+
+def test_dashboard_old_manifest_shows_rebuild_hint(tmp_path, monkeypatch):
+    (tmp_path / rekap_partition.MANIFEST_FILE).write_text(json.dumps({"format": 1, "version": "lama"}))
+    at = _run_dashboard(monkeypatch, tmp_path)
+    assert not at.exception
+    assert [e.value for e in at.error if rekap_partition.REBUILD_HINT in e.value]
+
+
+def test_dashboard_missing_partition_file_shows_error(tmp_path, monkeypatch):
+    manifest = build_partitions(make_employees(), make_org_sheets(), tmp_path)
+    (tmp_path / manifest["units"]["Unit C"]["file"]).unlink()
+    at = _run_dashboard(monkeypatch, tmp_path, unit="Unit C")
+    assert not at.exception
+    errors = [e.value for e in at.error]
+    assert any("Gagal memuat data terpartisi" in e and rekap_partition.REBUILD_HINT in e for e in errors)
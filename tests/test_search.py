@@ -0,0 +1,105 @@
+# tests/test_search.py
+# ==========================================
+# 🔎 EmployeeSearchIndex: urutan relevansi, toleransi typo, batas hasil
+# ==========================================
+
+import pytest
+
+import rekap_search
+from conftest import make_employees, make_org_sheets
+
+
+@pytest.fixture(scope="module")
+def index():
+    org_df = make_org_sheets()["Struktur Organisasi"]
+    return rekap_search.EmployeeSearchIndex(make_employees(), org_df, version="v1")
+
+
+def _pns(results):
+    return [r["pn"] for r in results]
+
+
+def test_pn_exact_ranks_above_pn_prefix(index):
+    results = index.search("1003")
+    assert _pns(results)[:2] == ["1003", "10031"]
+    assert (results[0]["score"], results[0]["match"]) == (rekap_search.SCORE_PN_EXACT, "PN")
+    assert (results[1]["score"], results[1]["match"]) == (rekap_search.SCORE_PN_PREFIX, "PN prefix")
+
+
+def test_pn_is_normalized(index):
+    assert _pns(index.search(" 1001.0 "))[:1] == ["1001"]
+
+
+def test_full_name_ranks_above_token_match(index):
+    results = index.search("ahmad fauzi")
+    assert results[0]["nama"] == "Ahmad Fauzi"
+    assert results[0]["score"] == rekap_search.SCORE_NAME_EXACT
+
+
+def test_name_prefix_and_case_insensitive(index):
+    results = index.search("SITI")
+    assert results[0]["nama"] == "Siti Aminah"
+    assert results[0]["score"] == rekap_search.SCORE_NAME_PREFIX
+
+
+def test_name_token_beats_position_token(index):
+    # "mandor" hanya ada di jabatan; "budi" di nama → nama lebih relevan
+    assert index.search("budi")[0]["nama"] == "Budi Santoso"
+    results = index.search("mandor")
+    assert {r["nama"] for r in results} == {"Budi Santoso", "Ahmad Fauzi"}
+    assert all(r["score"] == rekap_search.SCORE_POSITION_TOKEN for r in results)
+
+
+def test_all_query_tokens_must_match(index):
+    assert [r["nama"] for r in index.search("mandor panen")] == ["Ahmad Fauzi"]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("rizky", "Muhammad Rizki"),     # substitusi
+    ("amnah", "Siti Aminah"),        # hapus satu huruf
+    ("fauzii", "Ahmad Fauzi"),       # sisip satu huruf
+    ("santsoo", "Budi Santoso"),     # tukar dua huruf bersebelahan
+])
+def test_typo_within_one_edit(index, query, expected):
+    results = index.search(query)
+    assert [r["nama"] for r in results][:1] == [expected]
+    assert results[0]["score"] == rekap_search.SCORE_TOKEN_FUZZY
+
+
+def test_exact_token_ranks_above_typo():
+    df = make_employees()
+    df.loc[len(df)] = ["4001", "Budi Rizky", "Pekerja", "Unit C", "Karpel - Tetap", "L", 40]
+    index = rekap_search.EmployeeSearchIndex(df, version="v1")
+    assert [r["nama"] for r in index.search("rizki")] == ["Muhammad Rizki", "Budi Rizky"]
+
+
+@pytest.mark.parametrize("query", ["sxntxso", "amxnxh"])
+def test_two_edits_do_not_match(index, query):
+    assert index.search(query) == []
+
+
+def test_short_query_is_not_fuzzy(index):
+    # Token < MIN_FUZZY_LEN tidak dicocokkan dengan typo
+    assert index.search("bdi") == []
+
+
+def test_results_link_org_position(index):
+    result = index.search("1001")[0]
+    assert result["org"]["unit_kerja"] == "Unit A"
+    assert result["org"]["jabatan"] == "Mandor Tanaman"
+    assert index.search("2001")[0]["org"] is None
+
+
+def test_limit_keeps_best_results_sorted_by_name():
+    index = rekap_search.EmployeeSearchIndex(make_employees(extra_rows=40), version="v1")
+    results = index.search("tambahan", limit=5)
+    assert len(results) == 5
+    names = [r["nama"] for r in results]
+    assert names == sorted(r["nama"] for r in index.search("tambahan", limit=100))[:5]
+
+
+def test_results_to_frame(index):
+    frame = rekap_search.results_to_frame(index.search("1001"))
+    assert frame.loc[0, "NIK SAP"] == "1001"
+    assert frame.loc[0, "Posisi Struktur Organisasi"] == "Unit A / TANAMAN / Mandor Tanaman"
+    assert list(rekap_search.results_to_frame([]).columns) == list(frame.columns)
@@ -0,0 +1,168 @@
+# tests/test_upload.py
+# ==========================================
+# 🔐 Gerbang upload: akses admin/token, token publish, status publish per file
+# Ditambah satu uji AppTest: sidebar dashboard terkunci sampai akses dibuka.
+# ==========================================
+
+import threading
+
+import pytest
+
+import rekap_upload
+from conftest import EMPLOYEE_WORKBOOK, ORG_WORKBOOK, ROOT
+
+
+class _Response:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def _verify_ok(token):
+    return True, "Token terverifikasi."
+
+
+def _verify_denied(token):
+    return False, "Token tidak valid atau tidak punya akses push ke repo."
+
+
+# -----------------------------
+# Akses upload
+# -----------------------------
+def test_no_access_by_default():
+    state = {}
+    assert not rekap_upload.has_upload_access(state)
+    assert rekap_upload.publish_token(state, server_token="server") is None
+
+
+def test_admin_password_unlocks_and_uses_server_token():
+    state = {}
+    ok, _ = rekap_upload.unlock_upload(state, "rahasia", admin_password="rahasia", verify_token=_verify_denied)
+    assert ok
+    assert state["upload_access"] == rekap_upload.ACCESS_ADMIN
+    assert rekap_upload.has_upload_access(state)
+    assert rekap_upload.publish_token(state, server_token="server") == "server"
+    assert rekap_upload.publish_token(state, server_token=None) is None  # secrets belum ada → publish dilewati
+    assert "github_token_temp" not in state
+
+
+def test_user_token_unlocks_and_publishes_only_with_that_token():
+    state = {}
+    ok, _ = rekap_upload.unlock_upload(state, "ghp_user", admin_password="rahasia", verify_token=_verify_ok)
+    assert ok
+    assert state["upload_access"] == rekap_upload.ACCESS_TOKEN
+    assert rekap_upload.publish_token(state, server_token="server") == "ghp_user"
+
+
+@pytest.mark.parametrize("credential, admin_password", [
+    ("salah", "rahasia"),
+    ("", "rahasia"),
+    ("apa saja", None),  # tanpa upload_password, hanya token terverifikasi yang diterima
+])
+def test_rejected_credentials_leave_session_locked(credential, admin_password):
+    state = {}
+    ok, msg = rekap_upload.unlock_upload(state, credential, admin_password=admin_password, verify_token=_verify_denied)
+    assert not ok and msg.startswith("❌")
+    assert state == {}
+    assert not rekap_upload.has_upload_access(state)
+
+
+def test_unknown_access_value_is_not_access():
+    assert not rekap_upload.has_upload_access({"upload_access": True})
+    assert rekap_upload.publish_token({"upload_access": "tamu"}, server_token="server") is None
+
+
+@pytest.mark.parametrize("status, payload, expected", [
+    (200, {"permissions": {"push": True}}, True),
+    (200, {"permissions": {"push": False, "pull": True}}, False),
+    (401, {"message": "Bad credentials"}, False),
+])
+def test_github_token_can_push(monkeypatch, status, payload, expected):
+    calls = []
+
+    def fake_get(url, headers, timeout):
+        calls.append((url, headers["Authorization"], timeout))
+        return _Response(status, payload)
+
+    monkeypatch.setattr(rekap_upload.requests, "get", fake_get)
+    ok, _ = rekap_upload.github_token_can_push("ghp_x", "pemilik", "repo")
+    assert ok is expected
+    assert calls == [("https://api.github.com/repos/pemilik/repo", "Bearer ghp_x", rekap_upload.GITHUB_API_TIMEOUT)]
+
+
+def test_github_token_can_push_needs_repo_secrets():
+    assert rekap_upload.github_token_can_push("ghp_x", None, "repo")[0] is False
+
+
+# -----------------------------
+# Status publish
+# -----------------------------
+def test_publish_result_recorded():
+    jobs = rekap_upload.PublishJobs()
+    jobs.run_in_background("db.xlsx", "hash-1", lambda: (True, "✅ ok")).join(5)
+    assert jobs.items() == [("db.xlsx", {"hash": "hash-1", "status": "done", "message": "✅ ok"})]
+
+
+def test_publish_exception_marks_failed():
+    def boom():
+        raise RuntimeError("jaringan putus")
+
+    jobs = rekap_upload.PublishJobs()
+    jobs.run_in_background("db.xlsx", "hash-1", boom).join(5)
+    [(_, job)] = jobs.items()
+    assert job["status"] == "failed" and "jaringan putus" in job["message"]
+
+
+def test_older_publish_does_not_overwrite_newer_upload():
+    jobs = rekap_upload.PublishJobs()
+    release_old = threading.Event()
+
+    def slow_old_publish():
+        release_old.wait(5)
+        return False, "❌ Gagal upload: 409 – conflict"
+
+    old = jobs.run_in_background("db.xlsx", "hash-lama", slow_old_publish)
+    jobs.start("db.xlsx", "hash-baru")
+    release_old.set()
+    old.join(5)
+
+    [(_, job)] = jobs.items()
+    assert (job["hash"], job["status"]) == ("hash-baru", "running")
+    assert jobs.finish("db.xlsx", "hash-baru", True, "✅ ok")
+    assert jobs.items()[0][1]["status"] == "done"
+
+
+# -----------------------------
+# Dashboard (AppTest)
+# -----------------------------
+@pytest.mark.skipif(not (EMPLOYEE_WORKBOOK.exists() and ORG_WORKBOOK.exists()), reason="Workbook bawaan tidak ada")
+def test_dashboard_upload_is_locked_until_admin_password(monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.chdir(ROOT)  # dashboard membaca workbook relatif terhadap cwd
+    monkeypatch.delenv("REKAP_PARTITION_DIR", raising=False)
+    at = AppTest.from_file(str(ROOT / "streamlit_app.py"), default_timeout=120)
+    at.secrets["database_url"] = "https://example.invalid/db.xlsx"
+    at.secrets["upload_password"] = "rahasia"
+    at.run()
+    assert not at.exception
+
+    def upload_widgets():
+        return [w for w in at.sidebar.radio if w.key == "upload_target"]
+
+    assert upload_widgets() == []
+    assert at.session_state["upload_credential"] == ""
+
+    at.sidebar.text_input(key="upload_credential").input("salah").run()
+    at.sidebar.button(key="upload_unlock").click().run()
+    assert upload_widgets() == []
+    assert any("Akses ditolak" in e.value for e in at.sidebar.error)
+
+    at.sidebar.text_input(key="upload_credential").input("rahasia").run()
+    at.sidebar.button(key="upload_unlock").click().run()
+    assert not at.exception
+    assert at.session_state["upload_access"] == rekap_upload.ACCESS_ADMIN
+    assert len(upload_widgets()) == 1